@@ -0,0 +1,154 @@
+"""Time the house and owner lists and the CSV exports against the configured database.
+
+Lists are measured with and without their column projections, rows alone
+and the rendered first page; exports are streamed to the end without
+keeping the file. Run from the repository root, e.g.
+
+    python benchmarks/lists.py houses house-export --repeat 20
+    DJANGO_SETTINGS_MODULE=ems.settings.production python benchmarks/lists.py
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ems.settings.local')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from house.views import HouseExportView, HouseListView, OwnerListView  # noqa: E402
+from meter.models import MeterReading  # noqa: E402
+from meter.views import ReadingExportView  # noqa: E402
+from tenant.views import TenantExportView  # noqa: E402
+
+LISTS = {
+    'houses': (HouseListView, 'house-list'),
+    'owners': (OwnerListView, 'owner-list'),
+}
+EXPORTS = {
+    'house-export': (HouseExportView, 'house-export'),
+    'tenant-export': (TenantExportView, 'tenant-export'),
+    'reading-export': (ReadingExportView, 'reading-export'),
+}
+
+
+def all_columns(view_class):
+    """The list view loading every column, to compare against the only() projection it uses"""
+
+    def get_queryset(self):
+        queryset = view_class.get_queryset(self)
+        queryset.query.clear_deferred_loading()
+        return queryset
+
+    return type(f'AllColumns{view_class.__name__}', (view_class,), {'get_queryset': get_queryset})
+
+
+def fetch_rows(view_class, request):
+    """Evaluate the first page of a list view's queryset without rendering it"""
+    view = view_class()
+    view.setup(request)
+    return list(view.get_queryset()[:view.paginate_by])
+
+
+def stream(view_class, request):
+    """Bytes of a streamed response, read chunk by chunk as a client would"""
+    return sum(len(chunk) for chunk in view_class.as_view()(request).streaming_content)
+
+
+def measure(repeat, runs):
+    """Median milliseconds and peak KiB allocated of each named run.
+
+    Runs take turns within each repetition so drift affects them alike.
+    """
+    samples = {label: ([], []) for label in runs}
+    for _ in range(repeat):
+        for label, run in runs.items():
+            times, peaks = samples[label]
+            tracemalloc.start()
+            started = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - started)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+    return {
+        label: (statistics.median(times) * 1000, statistics.median(peaks) / 1024)
+        for label, (times, peaks) in samples.items()
+    }
+
+
+def benchmark_list(name, request, repeat):
+    view_class, _ = LISTS[name]
+    variants = {'only': view_class, 'all columns': all_columns(view_class)}
+    rows = measure(repeat, {
+        label: (lambda variant=variant: fetch_rows(variant, request)) for label, variant in variants.items()
+    })
+    pages = measure(repeat, {
+        label: (lambda variant=variant: variant.as_view()(request).render()) for label, variant in variants.items()
+    })
+    for label in variants:
+        print(
+            f"{f'{name} {label}':<22}{rows[label][0]:>9.1f}{rows[label][1]:>10.0f}"
+            f"{pages[label][0]:>9.1f}{pages[label][1]:>10.0f}"
+        )
+
+
+def benchmark_export(name, request, repeat):
+    view_class, _ = EXPORTS[name]
+    size = stream(view_class, request)
+    (elapsed, peak), = measure(repeat, {name: lambda: stream(view_class, request)}).values()
+    print(f'{name:<22}{elapsed:>9.1f}{peak:>10.0f}{size / 1024:>10.0f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('targets', nargs='*', help=f"Lists and exports to run: {', '.join([*LISTS, *EXPORTS])} (default: all)")
+    parser.add_argument('--repeat', type=int, default=15, help='Runs per variant; the median is reported')
+    parser.add_argument('--user', help='Username the pages are rendered for (default: first active user)')
+    parser.add_argument('--period', help='Period of the reading export as YYYY-MM (default: month of the latest reading)')
+    options = parser.parse_args()
+
+    unknown = set(options.targets) - LISTS.keys() - EXPORTS.keys()
+    if unknown:
+        parser.error(f"unknown targets: {', '.join(sorted(unknown))}")
+
+    users = User.objects.filter(is_active=True)
+    if options.user:
+        users = users.filter(username=options.user)
+    user = users.order_by('pk').first()
+    if user is None:
+        parser.error('no active user to render the lists for')
+
+    if options.period is None:
+        latest = MeterReading.objects.order_by('-reading_date').values_list('reading_date', flat=True).first()
+        options.period = f'{latest:%Y-%m}' if latest else ''
+
+    targets = options.targets or [*LISTS, *EXPORTS]
+    factory = RequestFactory()
+    lists = [name for name in LISTS if name in targets]
+    if lists:
+        print(f"{'list':<22}{'rows ms':>9}{'rows KiB':>10}{'page ms':>9}{'page KiB':>10}")
+    for name in lists:
+        request = factory.get(reverse(LISTS[name][1]))
+        request.user = user
+        benchmark_list(name, request, options.repeat)
+
+    exports = [name for name in EXPORTS if name in targets]
+    if exports:
+        print(f"{'export':<22}{'ms':>9}{'peak KiB':>10}{'file KiB':>10}")
+    for name in exports:
+        request = factory.get(reverse(EXPORTS[name][1]), {'period': options.period})
+        request.user = user
+        benchmark_export(name, request, options.repeat)
+
+
+if __name__ == '__main__':
+    main()
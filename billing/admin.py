@@ -0,0 +1,18 @@
+from django.contrib import admin
+from .models import BillingPeriod, Invoice, Tariff, TariffBand
+
+
+class TariffBandInline(admin.TabularInline):
+    model = TariffBand
+    extra = 1
+
+
+@admin.register(Tariff)
+class TariffAdmin(admin.ModelAdmin):
+    list_display = ['unit_type', 'effective_from']
+    list_filter = ['unit_type']
+    inlines = [TariffBandInline]
+
+
+admin.site.register(BillingPeriod)
+admin.site.register(Invoice)
@@ -0,0 +1,147 @@
+import calendar
+from datetime import date
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from meter.models import MeterReading
+from tenant.occupancy import tenancy_batch
+from .models import BillingPeriod, Invoice
+from .tariffs import TariffNotFound, price_batch
+
+INVOICE_FIELDS = ['opening_reading', 'closing_reading', 'consumption', 'amount', 'readings_count']
+BATCH_SIZE = 1000
+
+
+def period_bounds(label):
+    """First and last day of the month named by a YYYY-MM label"""
+    try:
+        year, month = (int(part) for part in label.split('-'))
+        start_date = date(year, month, 1)
+    except ValueError:
+        raise ValidationError(f'Invalid billing period "{label}", expected YYYY-MM')
+    return start_date, start_date.replace(day=calendar.monthrange(year, month)[1])
+
+
+def get_period(label):
+    """Return the BillingPeriod for a YYYY-MM label, creating it if needed"""
+    start_date, end_date = period_bounds(label)
+
+    period, _ = BillingPeriod.objects.get_or_create(
+        label=f'{start_date:%Y-%m}',
+        defaults={'start_date': start_date, 'end_date': end_date}
+    )
+    return period
+
+
+def period_consumption(period):
+    """Per house and tenancy consumption totals for the period.
+
+    Readings are fetched in one query and attributed to the tenancy
+    occupying the house on their reading date with one batched occupancy
+    lookup, so a house that changed hands is split between its tenants.
+    Opening and closing readings are taken per meter and summed, so a meter
+    replaced during the period does not mix the old and new meter's values.
+    """
+    readings = list(MeterReading.objects.filter(
+        reading_date__range=(period.start_date, period.end_date)
+    ).values_list(
+        'meter__house_id', 'meter__house__unit_type', 'meter_id', 'reading_date',
+        'previous_reading', 'current_reading', 'consumption',
+    ).order_by())
+    tenancies = tenancy_batch((reading[0], reading[3]) for reading in readings)
+
+    totals = {}
+    meters = {}
+    for (house_id, unit_type, meter_id, _, previous, current, units), tenancy_id in zip(readings, tenancies):
+        key = (house_id, tenancy_id)
+        row = totals.get(key)
+        if row is None:
+            row = totals[key] = {
+                'house_id': house_id,
+                'tenancy_id': tenancy_id,
+                'unit_type': unit_type,
+                'opening': 0,
+                'closing': 0,
+                'units': 0,
+                'count': 0,
+            }
+        row['units'] += units
+        row['count'] += 1
+        bounds = meters.get((key, meter_id))
+        if bounds is None:
+            meters[key, meter_id] = [previous, current]
+        else:
+            bounds[0] = min(bounds[0], previous)
+            bounds[1] = max(bounds[1], current)
+
+    for (key, _), (opening, closing) in meters.items():
+        totals[key]['opening'] += opening
+        totals[key]['closing'] += closing
+    return list(totals.values())
+
+
+def run_billing(period):
+    """Materialize the invoices of a period.
+
+    Reruns are idempotent: invoices whose source readings produce the same
+    figures are left untouched, changed ones are bulk updated and invoices
+    of houses or tenancies that no longer have readings in the period are
+    removed.
+    Amounts are priced with the tariff in effect on the last day of the
+    period; a unit type without one raises ValidationError and nothing is
+    written.
+    Returns the number of created, updated, deleted and unchanged invoices.
+    """
+    result = {'created': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+    now = timezone.now()
+
+    with transaction.atomic():
+        existing = {
+            (invoice.house_id, invoice.tenancy_id): invoice
+            for invoice in Invoice.objects.filter(period=period).only('id', 'house_id', 'tenancy_id', *INVOICE_FIELDS)
+        }
+
+        to_create = []
+        to_update = []
+        rows = list(period_consumption(period))
+        try:
+            amounts = price_batch(
+                (row['unit_type'], period.end_date, row['units']) for row in rows
+            )
+        except TariffNotFound as e:
+            raise ValidationError(f'Cannot bill {period}: {e}')
+        for row, amount in zip(rows, amounts):
+            values = {
+                'opening_reading': row['opening'],
+                'closing_reading': row['closing'],
+                'consumption': row['units'],
+                'amount': amount,
+                'readings_count': row['count'],
+            }
+            invoice = existing.pop((row['house_id'], row['tenancy_id']), None)
+            if invoice is None:
+                to_create.append(Invoice(
+                    period=period, house_id=row['house_id'], tenancy_id=row['tenancy_id'], **values
+                ))
+            elif any(getattr(invoice, field) != value for field, value in values.items()):
+                for field, value in values.items():
+                    setattr(invoice, field, value)
+                invoice.updated_at = now  # bulk_update skips auto_now
+                to_update.append(invoice)
+            else:
+                result['unchanged'] += 1
+
+        Invoice.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+        Invoice.objects.bulk_update(to_update, INVOICE_FIELDS + ['updated_at'], batch_size=BATCH_SIZE)
+        if existing:
+            Invoice.objects.filter(pk__in=[invoice.pk for invoice in existing.values()]).delete()
+
+        period.last_run_at = now
+        period.save(update_fields=['last_run_at'])
+
+    result['created'] = len(to_create)
+    result['updated'] = len(to_update)
+    result['deleted'] = len(existing)
+    return result
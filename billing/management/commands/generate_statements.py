@@ -0,0 +1,42 @@
+import os
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from billing.engine import period_bounds
+from billing.models import BillingPeriod
+from billing.statements import BATCH_SIZE, generate_statements
+
+
+class Command(BaseCommand):
+    help = 'Render the HTML statement of every tenancy in a billed period'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--period', required=True, help='Billing period as YYYY-MM')
+        parser.add_argument('--output', help='Directory to write to (default: STATEMENTS_ROOT/<period>)')
+        parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: one per CPU)')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--force', action='store_true', help='Render unchanged statements again')
+
+    def handle(self, *args, **options):
+        try:
+            start_date, _ = period_bounds(options['period'])
+        except ValidationError as e:
+            raise CommandError(' '.join(e.messages))
+        label = f'{start_date:%Y-%m}'
+        period = BillingPeriod.objects.filter(label=label, last_run_at__isnull=False).first()
+        if period is None:
+            raise CommandError(f'Period {label} has not been billed yet, run run_billing --period {label} first')
+
+        directory = options['output'] or os.path.join(settings.STATEMENTS_ROOT, period.label)
+        result = generate_statements(
+            period, directory,
+            workers=options['workers'],
+            force=options['force'],
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Statements {period} in {directory}: {result['rendered']} rendered, "
+            f"{result['unchanged']} unchanged, {result['removed']} removed."
+        ))
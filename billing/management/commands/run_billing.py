@@ -0,0 +1,23 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from billing.engine import get_period, run_billing
+
+
+class Command(BaseCommand):
+    help = 'Compute and store the invoices of every house for a billing period'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--period', required=True, help='Billing period as YYYY-MM')
+
+    def handle(self, *args, **options):
+        try:
+            period = get_period(options['period'])
+            result = run_billing(period)
+        except ValidationError as e:
+            raise CommandError(' '.join(e.messages))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Billing {period}: {result['created']} created, {result['updated']} updated, "
+            f"{result['deleted']} deleted, {result['unchanged']} unchanged."
+        ))
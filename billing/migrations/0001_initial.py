@@ -0,0 +1,49 @@
+# Generated by Django 4.2.16 on 2026-10-18 01:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('house', '0008_house_garbage_collected_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BillingPeriod',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('label', models.CharField(max_length=7, unique=True)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('last_run_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-start_date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Invoice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('opening_reading', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('closing_reading', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('consumption', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('readings_count', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('house', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='invoices', to='house.house')),
+                ('period', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='invoices', to='billing.billingperiod')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='invoice',
+            constraint=models.UniqueConstraint(fields=('period', 'house'), name='unique_invoice_per_period_house'),
+        ),
+    ]
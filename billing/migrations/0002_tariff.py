@@ -0,0 +1,56 @@
+# Generated by Django 4.2.16 on 2026-10-18 01:59
+
+import datetime
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def seed_flat_tariffs(apps, schema_editor):
+    # Carry over the rate that used to be copied onto every meter reading
+    Tariff = apps.get_model('billing', 'Tariff')
+    TariffBand = apps.get_model('billing', 'TariffBand')
+    for unit_type in ['2BR', '3BR']:
+        tariff = Tariff.objects.create(unit_type=unit_type, effective_from=datetime.date(2000, 1, 1))
+        TariffBand.objects.create(tariff=tariff, up_to=None, rate=Decimal('171'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tariff',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unit_type', models.CharField(choices=[('2BR', '2 Bedroom'), ('3BR', '3 Bedroom')], max_length=10)),
+                ('effective_from', models.DateField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['unit_type', '-effective_from'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TariffBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('up_to', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('rate', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('tariff', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bands', to='billing.tariff')),
+            ],
+            options={
+                'ordering': ['tariff', 'up_to'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='tariff',
+            constraint=models.UniqueConstraint(fields=('unit_type', 'effective_from'), name='unique_tariff_per_unit_type_date'),
+        ),
+        migrations.RunPython(seed_flat_tariffs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.16 on 2026-10-18 02:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenant', '0004_tenancy_occupancy'),
+        ('billing', '0002_tariff'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='invoice',
+            name='unique_invoice_per_period_house',
+        ),
+        migrations.AddField(
+            model_name='invoice',
+            name='tenancy',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='invoices', to='tenant.tenancy'),
+        ),
+        migrations.AddConstraint(
+            model_name='invoice',
+            constraint=models.UniqueConstraint(fields=('period', 'house', 'tenancy'), name='unique_invoice_per_period_tenancy'),
+        ),
+        migrations.AddConstraint(
+            model_name='invoice',
+            constraint=models.UniqueConstraint(condition=models.Q(('tenancy__isnull', True)), fields=('period', 'house'), name='unique_vacant_invoice_per_period_house'),
+        ),
+    ]
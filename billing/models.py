@@ -0,0 +1,80 @@
+from django.db import models
+from house.models import House
+
+
+class Tariff(models.Model):
+    """Water rate table of a unit type, effective from a date until the next one"""
+    unit_type = models.CharField(max_length=10, choices=House.UNIT_CHOICES)
+    effective_from = models.DateField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.get_unit_type_display()} from {self.effective_from}"
+
+    class Meta:
+        ordering = ['unit_type', '-effective_from']
+        constraints = [
+            models.UniqueConstraint(fields=['unit_type', 'effective_from'], name='unique_tariff_per_unit_type_date'),
+        ]
+
+
+class TariffBand(models.Model):
+    """Rate charged for the units of a tariff up to up_to (unbounded when empty)"""
+    tariff = models.ForeignKey(Tariff, on_delete=models.CASCADE, related_name='bands')
+    up_to = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    rate = models.DecimalField(max_digits=8, decimal_places=2)
+
+    def __str__(self):
+        return f"{self.tariff} - up to {self.up_to or 'any'} @ {self.rate}"
+
+    class Meta:
+        ordering = ['tariff', 'up_to']
+
+
+class BillingPeriod(models.Model):
+    label = models.CharField(max_length=7, unique=True)  # YYYY-MM
+    start_date = models.DateField()
+    end_date = models.DateField()
+    last_run_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.label
+
+    class Meta:
+        ordering = ['-start_date']
+
+
+class Invoice(models.Model):
+    """Materialized water bill of a house for one billing period.
+
+    A house changing hands during the period gets one invoice per tenancy;
+    readings taken while it was vacant are billed without one.
+    """
+    period = models.ForeignKey(BillingPeriod, on_delete=models.CASCADE, related_name='invoices')
+    house = models.ForeignKey(House, on_delete=models.PROTECT, related_name='invoices')
+    tenancy = models.ForeignKey(
+        'tenant.Tenancy', on_delete=models.PROTECT, null=True, blank=True, related_name='invoices'
+    )
+    opening_reading = models.DecimalField(max_digits=10, decimal_places=2)
+    closing_reading = models.DecimalField(max_digits=10, decimal_places=2)
+    consumption = models.DecimalField(max_digits=10, decimal_places=2)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    readings_count = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.period} - House {self.house.hse_number}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['period', 'house', 'tenancy'], name='unique_invoice_per_period_tenancy'),
+            # NULLs are distinct in the constraint above
+            models.UniqueConstraint(
+                fields=['period', 'house'],
+                condition=models.Q(tenancy__isnull=True),
+                name='unique_vacant_invoice_per_period_house'
+            ),
+        ]
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Tariff, TariffBand
+from .tariffs import resolver
+
+
+@receiver([post_save, post_delete], sender=Tariff)
+@receiver([post_save, post_delete], sender=TariffBand)
+def clear_tariff_cache(sender, **kwargs):
+    resolver.clear()
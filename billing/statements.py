@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+import django
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+from django.template.loader import get_template, render_to_string
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from meter.models import MeterReading
+from tenant.models import Tenancy
+from tenant.occupancy import as_instant, tenancy_batch
+from .models import Invoice
+
+STATEMENT_TEMPLATE = 'billing/statement.html'
+MANIFEST = 'manifest.json'
+BATCH_SIZE = 200
+
+
+def statement_contexts(period):
+    """Template context of every tenancy occupying a house during the period.
+
+    Tenancies, readings and invoices are each read in one query and readings
+    are attributed to tenancies with one batched occupancy lookup. Contexts
+    are plain data so they can be hashed and sent to worker processes.
+    """
+    start = as_instant(period.start_date)
+    end = as_instant(period.end_date + timedelta(days=1))
+    tenancies = Tenancy.objects.filter(
+        Q(end_date__isnull=True) | Q(end_date__gt=start), start_date__lt=end,
+    ).select_related('tenant', 'house').only(
+        'id', 'start_date', 'end_date', 'house__hse_number',
+        'tenant__first_name', 'tenant__last_name', 'tenant__phone_number', 'tenant__email',
+    ).order_by('house__hse_number', 'start_date')
+
+    readings = list(MeterReading.objects.filter(
+        reading_date__range=(period.start_date, period.end_date)
+    ).order_by('reading_date', 'meter_id', 'id').values_list(
+        'meter__house_id', 'meter__meter_number', 'reading_date',
+        'previous_reading', 'current_reading', 'consumption', 'is_estimated',
+    ))
+    tenancy_readings = defaultdict(list)
+    for reading, tenancy_id in zip(readings, tenancy_batch((reading[0], reading[2]) for reading in readings)):
+        if tenancy_id is not None:
+            _, meter_number, reading_date, previous, current, units, is_estimated = reading
+            tenancy_readings[tenancy_id].append({
+                'meter_number': meter_number,
+                'reading_date': reading_date,
+                'previous_reading': previous,
+                'current_reading': current,
+                'consumption': units,
+                'is_estimated': is_estimated,
+            })
+
+    invoices = {
+        invoice['tenancy_id']: invoice
+        for invoice in Invoice.objects.filter(period=period, tenancy__isnull=False).values(
+            'tenancy_id', 'opening_reading', 'closing_reading', 'consumption', 'amount', 'readings_count',
+        )
+    }
+
+    for tenancy in tenancies:
+        yield {
+            'tenancy_id': tenancy.pk,
+            'tenant_name': tenancy.tenant.get_full_name(),
+            'tenant_phone': tenancy.tenant.phone_number,
+            'tenant_email': tenancy.tenant.email,
+            'hse_number': tenancy.house.hse_number,
+            'tenancy_start': timezone.localtime(tenancy.start_date).date(),
+            'tenancy_end': tenancy.end_date and timezone.localtime(tenancy.end_date).date(),
+            'period': period.label,
+            'period_start': period.start_date,
+            'period_end': period.end_date,
+            'readings': tenancy_readings.get(tenancy.pk, []),
+            'invoice': invoices.get(tenancy.pk),
+        }
+
+
+def statement_digest(context, template_source):
+    """Fingerprint of what a statement renders, so unchanged ones are not rendered again"""
+    data = json.dumps([template_source, context], cls=DjangoJSONEncoder, sort_keys=True)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def write_atomic(path, text):
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(temporary, path)
+
+
+def render_batch(directory, batch):
+    """Render (filename, context) pairs into directory, run inside a worker process"""
+    for filename, context in batch:
+        write_atomic(os.path.join(directory, filename), render_to_string(STATEMENT_TEMPLATE, context))
+    return len(batch)
+
+
+def load_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def generate_statements(period, directory, workers=None, force=False, batch_size=BATCH_SIZE):
+    """Render the HTML statements of a period into directory with a manifest.
+
+    The manifest records a digest of each statement's data and template;
+    statements whose digest and file are unchanged since the last run are
+    skipped, the others are rendered in batches across a pool of
+    ``workers`` processes (one per CPU by default) and files of tenancies
+    no longer in the period are removed.
+    Returns the number of rendered, unchanged and removed statements.
+    """
+    os.makedirs(directory, exist_ok=True)
+    previous = load_manifest(directory).get('statements', {})
+    template_source = get_template(STATEMENT_TEMPLATE).template.source
+
+    statements = {}
+    pending = []
+    for context in statement_contexts(period):
+        key = str(context['tenancy_id'])
+        filename = get_valid_filename(f"{context['hse_number']}-{context['tenancy_id']}.html")
+        digest = statement_digest(context, template_source)
+        statements[key] = {
+            'file': filename,
+            'digest': digest,
+            'tenant': context['tenant_name'],
+            'house': context['hse_number'],
+            'amount': context['invoice'] and context['invoice']['amount'],
+        }
+        known = previous.get(key)
+        if (force or known is None or known['digest'] != digest or known['file'] != filename
+                or not os.path.exists(os.path.join(directory, filename))):
+            pending.append((filename, context))
+
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    if workers == 1 or len(batches) <= 1:
+        for batch in batches:
+            render_batch(directory, batch)
+    elif batches:
+        # Workers only render; forked copies of open connections must not be shared
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as executor:
+            list(executor.map(render_batch, [directory] * len(batches), batches))
+
+    current_files = {entry['file'] for entry in statements.values()}
+    removed = 0
+    for entry in previous.values():
+        if entry['file'] not in current_files:
+            removed += 1
+            try:
+                os.remove(os.path.join(directory, entry['file']))
+            except FileNotFoundError:
+                pass
+
+    write_atomic(os.path.join(directory, MANIFEST), json.dumps({
+        'period': period.label,
+        'generated_at': timezone.now(),
+        'statements': statements,
+    }, cls=DjangoJSONEncoder, indent=2))
+
+    return {
+        'rendered': len(pending),
+        'unchanged': len(statements) - len(pending),
+        'removed': removed,
+    }
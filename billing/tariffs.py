@@ -0,0 +1,108 @@
+import time
+from bisect import bisect_right
+from collections import defaultdict
+from decimal import Decimal
+
+from .models import Tariff
+
+CENT = Decimal('0.01')
+
+
+class TariffNotFound(Exception):
+    pass
+
+
+class RateTable:
+    """Tiered rates of one tariff, precomputed for O(log bands) pricing"""
+
+    def __init__(self, bands):
+        # Unbounded band last, bounded ones by their upper limit
+        bands = sorted(bands, key=lambda band: (band[0] is None, band[0] or 0))
+        self.lowers = []
+        self.rates = []
+        self.bases = []
+        lower = base = Decimal(0)
+        for up_to, rate in bands:
+            self.lowers.append(lower)
+            self.rates.append(rate)
+            self.bases.append(base)
+            if up_to is None:
+                break
+            base += (up_to - lower) * rate
+            lower = up_to
+
+    def price(self, units):
+        if not self.rates:
+            raise TariffNotFound('Tariff has no rate bands')
+        band = max(bisect_right(self.lowers, units) - 1, 0)
+        return (self.bases[band] + (units - self.lowers[band]) * self.rates[band]).quantize(CENT)
+
+
+class TariffResolver:
+    """In-process cache of rate tables keyed by unit type and date.
+
+    All tariffs and their bands are loaded at once and resolved per date with a
+    binary search. The cache is cleared by the tariff signals in this
+    process and expires after ``ttl`` seconds so other worker processes
+    pick up changes too.
+    """
+
+    def __init__(self, ttl=60):
+        self.ttl = ttl
+        self.clear()
+
+    def clear(self):
+        self._tariffs = None
+        self._resolved = {}
+        self._loaded_at = 0
+
+    def _load(self):
+        tariffs = defaultdict(list)
+        for tariff in Tariff.objects.prefetch_related('bands').order_by('effective_from'):
+            table = RateTable([(band.up_to, band.rate) for band in tariff.bands.all()])
+            tariffs[tariff.unit_type].append((tariff.effective_from, table))
+        self._tariffs = {
+            unit_type: ([start for start, _ in entries], [table for _, table in entries])
+            for unit_type, entries in tariffs.items()
+        }
+        self._resolved = {}
+        self._loaded_at = time.monotonic()
+
+    def rate_table(self, unit_type, on_date):
+        if self._tariffs is None or time.monotonic() - self._loaded_at > self.ttl:
+            self._load()
+
+        key = (unit_type, on_date)
+        table = self._resolved.get(key)
+        if table is None:
+            starts, tables = self._tariffs.get(unit_type, ((), ()))
+            index = bisect_right(starts, on_date) - 1
+            if index < 0:
+                raise TariffNotFound(f'No {unit_type} tariff in effect on {on_date}')
+            table = self._resolved[key] = tables[index]
+        return table
+
+
+resolver = TariffResolver()
+
+
+def price(unit_type, on_date, units):
+    """Bill amount of units consumed by a unit type on a date"""
+    return resolver.rate_table(unit_type, on_date).price(units)
+
+
+def price_batch(items):
+    """Price an iterable of (unit_type, date, units) in one call.
+
+    Rate tables are resolved once per distinct unit type and date, so
+    thousands of readings cost a handful of dictionary lookups each.
+    """
+    tables = {}
+    amounts = []
+    for unit_type, on_date, units in items:
+        key = (unit_type, on_date)
+        table = tables.get(key)
+        if table is None:
+            table = tables[key] = resolver.rate_table(unit_type, on_date)
+        amounts.append(table.price(units))
+    return amounts
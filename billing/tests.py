@@ -0,0 +1,124 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+
+from house.models import House
+from meter.models import Meter, MeterReading
+from tenant.models import Tenancy, Tenant
+from tenant.occupancy import as_instant
+from .engine import get_period, run_billing
+from .models import Invoice, Tariff
+from .tariffs import RateTable, TariffNotFound, price
+
+
+class RateTableTests(SimpleTestCase):
+    table = RateTable([(None, Decimal(30)), (Decimal(200), Decimal(20)), (Decimal(100), Decimal(10))])
+
+    def test_band_boundaries(self):
+        for units, amount in [(0, 0), (100, 1000), (150, 2000), (200, 3000)]:
+            with self.subTest(units=units):
+                self.assertEqual(self.table.price(Decimal(units)), Decimal(amount))
+
+    def test_units_past_the_last_bound_are_charged_at_the_open_band(self):
+        self.assertEqual(self.table.price(Decimal(250)), Decimal(4500))
+
+    def test_bounded_table_charges_the_excess_at_its_last_rate(self):
+        table = RateTable([(Decimal(100), Decimal(10))])
+        self.assertEqual(table.price(Decimal(150)), Decimal(1500))
+
+    def test_amounts_are_rounded_to_cents(self):
+        table = RateTable([(None, Decimal('0.333'))])
+        self.assertEqual(table.price(Decimal(10)), Decimal('3.33'))
+        self.assertEqual(table.price(Decimal('1.5')), Decimal('0.50'))
+
+    def test_table_without_bands_is_not_found(self):
+        with self.assertRaises(TariffNotFound):
+            RateTable([]).price(Decimal(1))
+
+
+class TariffPriceTests(TestCase):
+    def setUp(self):
+        Tariff.objects.all().delete()  # The flat tariffs seeded by the migrations
+        Tariff.objects.create(unit_type='2BR', effective_from=date(2025, 1, 1)).bands.create(rate=Decimal(10))
+        Tariff.objects.create(unit_type='2BR', effective_from=date(2026, 1, 1)).bands.create(rate=Decimal(12))
+
+    def test_tariff_in_effect_on_the_date_is_used(self):
+        self.assertEqual(price('2BR', date(2025, 12, 31), Decimal(10)), Decimal(100))
+        self.assertEqual(price('2BR', date(2026, 1, 1), Decimal(10)), Decimal(120))
+
+    def test_date_before_any_tariff_is_not_found(self):
+        with self.assertRaises(TariffNotFound):
+            price('2BR', date(2024, 12, 31), Decimal(10))
+        with self.assertRaises(TariffNotFound):
+            price('3BR', date(2026, 1, 1), Decimal(10))
+
+
+class BillingRunTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='reader')
+        self.house = House.objects.create(hse_number='A1', unit_type='2BR')
+        Tariff.objects.create(unit_type='2BR', effective_from=date(2020, 1, 1)).bands.create(rate=Decimal(100))
+        self.old_meter = Meter.objects.create(
+            meter_number='M-A1', house=self.house, installation_date=date(2024, 1, 1)
+        )
+        tenant = Tenant.objects.create(first_name='Jane', last_name='Doe', phone_number='0700000000', id_cardnumber=1)
+        self.tenancy = Tenancy.objects.create(tenant=tenant, house=self.house, start_date=as_instant(date(2026, 3, 10)))
+        self.period = get_period('2026-03')
+
+        self.add(self.old_meter, 10, date(2026, 3, 2))
+        self.add(self.old_meter, 25, date(2026, 3, 15))
+        # Replaced by a new meter starting from zero
+        self.new_meter = Meter.objects.create(
+            meter_number='M-A1-2', house=self.house, installation_date=date(2026, 3, 20)
+        )
+        self.add(self.new_meter, 4, date(2026, 3, 20))
+        self.add(self.new_meter, 9, date(2026, 3, 31))
+
+    def add(self, meter, value, reading_date):
+        reading = MeterReading(meter=meter, current_reading=Decimal(value), reading_date=reading_date, read_by=self.user)
+        reading.save()
+        return reading
+
+    def invoices(self):
+        """(tenancy_id, opening, closing, consumption, amount, readings_count) of the period's invoices"""
+        return set(Invoice.objects.filter(period=self.period).values_list(
+            'tenancy_id', 'opening_reading', 'closing_reading', 'consumption', 'amount', 'readings_count'
+        ))
+
+    def test_readings_are_split_between_vacancy_and_tenancy(self):
+        self.assertEqual(run_billing(self.period), {'created': 2, 'updated': 0, 'deleted': 0, 'unchanged': 0})
+        self.assertEqual(self.invoices(), {
+            (None, 0, 10, 10, 1000, 1),
+            # 10 -> 25 on the old meter and 0 -> 9 on the new one
+            (self.tenancy.pk, 10, 34, 24, 2400, 3),
+        })
+
+    def test_rerun_without_changes_leaves_invoices_untouched(self):
+        run_billing(self.period)
+        updated_at = dict(Invoice.objects.values_list('pk', 'updated_at'))
+
+        self.assertEqual(run_billing(self.period), {'created': 0, 'updated': 0, 'deleted': 0, 'unchanged': 2})
+        self.assertEqual(dict(Invoice.objects.values_list('pk', 'updated_at')), updated_at)
+
+    def test_rerun_updates_changed_and_deletes_stale_invoices(self):
+        run_billing(self.period)
+        self.add(self.new_meter, 12, date(2026, 3, 31))
+        MeterReading.objects.filter(meter=self.old_meter, reading_date=date(2026, 3, 2)).delete()
+
+        self.assertEqual(run_billing(self.period), {'created': 0, 'updated': 1, 'deleted': 1, 'unchanged': 0})
+        # The chain repair makes the old meter's remaining reading start from zero
+        self.assertEqual(self.invoices(), {(self.tenancy.pk, 0, 37, 37, 3700, 4)})
+
+    def test_unit_type_without_a_tariff_fails_the_run(self):
+        Tariff.objects.all().delete()
+
+        with self.assertRaisesMessage(ValidationError, 'No 2BR tariff in effect on 2026-03-31'):
+            run_billing(self.period)
+        with self.assertRaises(CommandError):
+            call_command('run_billing', period='2026-03')
+        self.assertFalse(Invoice.objects.exists())
@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('billing/', views.InvoiceListView.as_view(), name='billing'),
+    path('billing/<str:period>/', views.InvoiceListView.as_view(), name='invoice-list'),
+]
@@ -0,0 +1,37 @@
+from django.views.generic import ListView
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.shortcuts import get_object_or_404
+from django.http import Http404
+from django.db.models import Count, Sum
+from .models import BillingPeriod
+
+
+class InvoiceListView(LoginRequiredMixin, ListView):
+    template_name = 'billing/invoice_list.html'
+    context_object_name = 'invoices'
+    paginate_by = 100
+
+    def get_period(self):
+        if 'period' in self.kwargs:
+            return get_object_or_404(BillingPeriod, label=self.kwargs['period'])
+        period = BillingPeriod.objects.first()
+        if period is None:
+            raise Http404('No billing run yet')
+        return period
+
+    def get_queryset(self):
+        self.period = self.get_period()
+        return self.period.invoices.select_related('house', 'tenancy__tenant').order_by(
+            'house__hse_number', 'tenancy__start_date'
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['period'] = self.period
+        context['periods'] = BillingPeriod.objects.all()
+        context['totals'] = self.period.invoices.aggregate(
+            invoices_count=Count('id'),
+            consumption=Sum('consumption'),
+            amount=Sum('amount'),
+        )
+        return context
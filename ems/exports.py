@@ -0,0 +1,51 @@
+import csv
+import io
+
+from django.http import StreamingHttpResponse
+
+CHUNK_SIZE = 2000
+
+
+def csv_chunks(header, rows, chunk_size=CHUNK_SIZE):
+    """Encode rows as CSV text, yielding the header at once and then one chunk per chunk_size rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM so Excel opens the file as UTF-8; the importers read it as utf-8-sig
+    buffer.write('\ufeff')
+    writer.writerow(header)
+    yield buffer.getvalue()
+
+    pending = 0
+    for row in rows:
+        if not pending:
+            buffer.seek(0)
+            buffer.truncate()
+        writer.writerow(row)
+        pending += 1
+        if pending == chunk_size:
+            yield buffer.getvalue()
+            pending = 0
+    if pending:
+        yield buffer.getvalue()
+
+
+def csv_response(filename, header, rows):
+    """Stream rows as a CSV attachment without holding the file in memory"""
+    response = StreamingHttpResponse(csv_chunks(header, rows), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def write_csv(stream, header, rows):
+    """Write rows as CSV to a text stream and return how many were written"""
+    written = 0
+
+    def counted():
+        nonlocal written
+        for row in rows:
+            written += 1
+            yield row
+
+    for chunk in csv_chunks(header, counted()):
+        stream.write(chunk)
+    return written
@@ -0,0 +1,29 @@
+import csv
+import io
+
+
+class UnreadableFile(ValueError):
+    """Upload is not UTF-8 text or not well-formed CSV"""
+
+
+def open_upload(upload):
+    """Wrap an uploaded file in a text stream without reading it into memory"""
+    return io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+
+
+def checked(rows):
+    """Re-raise decoding and CSV errors met while reading rows as UnreadableFile"""
+    rows = iter(rows)
+    while True:
+        try:
+            item = next(rows)
+        except StopIteration:
+            return
+        except (UnicodeDecodeError, csv.Error) as e:
+            raise UnreadableFile(f'File could not be read: {e}') from e
+        yield item
+
+
+def read_csv_rows(stream):
+    """Yield (line_number, row) pairs from a CSV text stream"""
+    return checked(enumerate(csv.DictReader(stream), start=2))
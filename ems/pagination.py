@@ -0,0 +1,198 @@
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.db.models import Q
+from django.http import Http404
+from django.utils.functional import cached_property
+
+CURSOR_PARAMS = ('after', 'before')
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """Keeps microseconds, which DjangoJSONEncoder drops, so cursors land between equal timestamps"""
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values):
+    """Opaque URL-safe token for the ordering values of a row"""
+    data = json.dumps(values, cls=CursorEncoder, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    data = base64.urlsafe_b64decode((cursor + '=' * (-len(cursor) % 4)).encode())
+    values = json.loads(data)
+    if not isinstance(values, list):
+        raise ValueError('Cursor is not a list of values')
+    return values
+
+
+def estimated_count(model):
+    """Row count of a model's table from the PostgreSQL planner statistics.
+
+    Returns None when the table has not been analyzed yet.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [model._meta.db_table])
+        row = cursor.fetchone()
+    return row[0] if row and row[0] >= 0 else None
+
+
+def keyset_filter(fields, descending, values, backwards=False):
+    """Rows strictly after values in the (fields, descending) ordering, or before it when backwards"""
+    condition = Q()
+    for index, field in enumerate(fields):
+        lookup = 'lt' if descending[index] != backwards else 'gt'
+        step = Q(**{f'{field}__{lookup}': values[index]})
+        for previous_field, previous_value in zip(fields[:index], values[:index]):
+            step &= Q(**{previous_field: previous_value})
+        condition |= step
+    return condition
+
+
+class KeysetPage:
+    """One page of a keyset paginated list with cursors to its neighbours"""
+
+    def __init__(self, object_list, next_cursor, previous_cursor, count):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self._count = count
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    @cached_property
+    def _total(self):
+        return self._count()
+
+    @property
+    def total(self):
+        """Size of the whole list, only counted when shown"""
+        return self._total[0]
+
+    @property
+    def total_is_estimate(self):
+        return self._total[1]
+
+
+class KeysetPaginationMixin:
+    """ListView mixin paginating with ?after=/?before= cursors instead of OFFSET.
+
+    An empty ?before= opens the last page; ``first_url``, ``previous_url``,
+    ``next_url`` and ``last_url`` in the context keep the other query
+    parameters, properly encoded. Pages are read with a WHERE on the ``keyset`` ordering columns (prefix
+    with '-' for descending; the last one must be unique), so a deep page
+    costs the same index range scan as the first one. The total is only
+    counted when a template asks for ``page_obj.total``; with
+    ``estimate_count`` unfiltered lists on PostgreSQL use the planner's row
+    estimate instead of COUNT(*).
+    """
+    keyset = ('id',)
+    estimate_count = False
+
+    def get_keyset(self):
+        return self.keyset
+
+    def page_url(self, **cursor):
+        """Querystring of the current list with its filters and the given cursor"""
+        params = self.request.GET.copy()
+        for key in CURSOR_PARAMS:
+            params.pop(key, None)
+        for key, value in cursor.items():
+            params[key] = value
+        return f'?{params.urlencode()}'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = context.get('page_obj')
+        if page is not None:
+            context.update({
+                'first_url': self.page_url(),
+                'previous_url': self.page_url(before=page.previous_cursor) if page.has_previous else None,
+                'next_url': self.page_url(after=page.next_cursor) if page.has_next else None,
+                'last_url': self.page_url(before=''),
+            })
+        return context
+
+    def is_filtered(self):
+        """Whether query parameters other than the cursor narrow the list"""
+        return any(value for key, value in self.request.GET.items() if key not in CURSOR_PARAMS)
+
+    def get_total_count(self, queryset):
+        if self.estimate_count and connection.vendor == 'postgresql' and not self.is_filtered():
+            estimate = estimated_count(queryset.model)
+            if estimate is not None:
+                return estimate, True
+        return queryset.count(), False
+
+    def paginate_queryset(self, queryset, page_size):
+        keyset = self.get_keyset()
+        fields = [name.lstrip('-') for name in keyset]
+        descending = [name.startswith('-') for name in keyset]
+
+        after = self.request.GET.get('after', '')
+        backwards = not after and 'before' in self.request.GET
+        cursor = after or self.request.GET.get('before', '')
+        ordering = [f"{'-' if desc != backwards else ''}{field}" for field, desc in zip(fields, descending)]
+
+        page = queryset.order_by(*ordering)
+        if cursor:
+            try:
+                raw = decode_cursor(cursor)
+                if len(raw) != len(fields):
+                    raise ValueError('Cursor does not match the ordering')
+                values = [
+                    queryset.model._meta.get_field(field).to_python(value)
+                    for field, value in zip(fields, raw)
+                ]
+            except (ValueError, TypeError, binascii.Error, ValidationError):
+                raise Http404('Invalid page cursor')
+            page = page.filter(keyset_filter(fields, descending, values, backwards))
+
+        rows = list(page[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if backwards:
+            rows.reverse()
+
+        def cursor_of(row):
+            return encode_cursor([row[f] if isinstance(row, dict) else getattr(row, f) for f in fields])
+
+        if backwards:
+            has_next, has_previous = bool(cursor), has_more
+        else:
+            has_next, has_previous = has_more, bool(cursor)
+        page_obj = KeysetPage(
+            rows,
+            next_cursor=cursor_of(rows[-1]) if rows and has_next else None,
+            previous_cursor=cursor_of(rows[0]) if rows and has_previous else None,
+            count=lambda: self.get_total_count(queryset),
+        )
+        return None, page_obj, rows, page_obj.has_other_pages()
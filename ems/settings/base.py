@@ -18,6 +18,7 @@ INSTALLED_APPS = [
     'house.apps.HouseConfig',
     'meter.apps.MeterConfig',
     'tenant.apps.TenantConfig',
+    'billing.apps.BillingConfig',
     'systemconf.apps.SystemconfConfig',
 ]
 
@@ -82,3 +83,6 @@ USE_TZ = True
 # URLs
 LOGIN_REDIRECT_URL = 'house-list'
 LOGOUT_REDIRECT_URL = 'login'
+
+# Tenant statements written by generate_statements, one directory per billing period
+STATEMENTS_ROOT = os.path.join(BASE_DIR, 'statements')
@@ -45,6 +45,7 @@ urlpatterns = [
     path('', include('house.urls')),
     path('', include('tenant.urls')),
     path('', include('meter.urls')),
+    path('', include('billing.urls')),
 ]
 
 
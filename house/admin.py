@@ -1,7 +1,14 @@
 from django.contrib import admin
-from .models import House, Owner
+from .models import GarbageCollection, House, Owner
 
 # Register your models here.
 default_auto_field = 'django.db.models.BigAutoField'
 admin.site.register(House)
-admin.site.register(Owner)
\ No newline at end of file
+admin.site.register(Owner)
+
+
+@admin.register(GarbageCollection)
+class GarbageCollectionAdmin(admin.ModelAdmin):
+    list_display = ['house', 'period', 'collected_at', 'collected_by']
+    list_filter = ['period']
+    raw_id_fields = ['house']
@@ -4,4 +4,6 @@ from django.apps import AppConfig
 class HouseConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'house'
-    
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,15 @@
+from ems.exports import CHUNK_SIZE
+
+from .importers import HOUSE_FIELDS, OWNER_FIELDS
+from .models import House
+
+# Same columns the importer reads, so an export can be loaded back
+HOUSE_EXPORT_HEADER = HOUSE_FIELDS + OWNER_FIELDS
+
+
+def house_rows(chunk_size=CHUNK_SIZE):
+    """One row per house and owner in a single streamed query; houses without an owner come once with blanks"""
+    return House.objects.order_by('hse_number', 'owner_set__id').values_list(
+        *HOUSE_FIELDS,
+        *(f'owner_set__{field}' for field in OWNER_FIELDS),
+    ).iterator(chunk_size=chunk_size)
@@ -23,4 +23,8 @@ class OwnerForm(forms.ModelForm):
         widgets = {
             'address': forms.Textarea(attrs={'rows': 3}),
             'house': forms.SelectMultiple(attrs={'class': 'select2'}),
-        }
\ No newline at end of file
+        }
+
+class HouseImportForm(forms.Form):
+    file = forms.FileField()
+    dry_run = forms.BooleanField(required=False)
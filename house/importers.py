@@ -0,0 +1,192 @@
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+
+from .models import House, Owner
+from .signals import refresh_houses
+
+CHUNK_SIZE = 1000
+HOUSE_FIELDS = ['hse_number', 'unit_type', 'status', 'handover']
+OWNER_FIELDS = [
+    'first_name', 'middle_name', 'last_name', 'email',
+    'phone_number', 'kra_pin', 'address', 'nationality',
+]
+# Owner identities, in the order they are trusted when matching
+OWNER_KEYS = ['kra_pin', 'phone_number', 'email']
+# Columns a matched owner must agree with before a house is linked to it
+OWNER_IDENTITY = ['kra_pin', 'first_name', 'last_name', 'phone_number', 'email']
+
+
+class HouseImporter:
+    """Create houses and their owners from CSV rows in bulk.
+
+    Each row is a house (hse_number, unit_type, optional status and
+    handover) and optionally its owner. Owners are matched against existing
+    rows by KRA PIN, phone number or email with one query per chunk and
+    against owners created earlier in the file, so an owner of several
+    houses is created once. Houses, new owners and their links are inserted
+    with bulk_create per chunk. Invalid rows and conflicts (existing house
+    numbers, keys belonging to different owners, a matched owner whose name
+    or contacts differ from the row) are collected in
+    ``errors`` and do not abort the rest of the batch. With ``dry_run``
+    everything is validated and counted, then rolled back.
+    """
+
+    def __init__(self, created_by, chunk_size=CHUNK_SIZE, dry_run=False):
+        self.created_by = created_by
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.houses_created = 0
+        self.owners_created = 0
+        self.owners_matched = 0
+        self.errors = []
+        self._owners = {}
+        self._house_numbers = set()
+        self._fields = {field.name: field for field in House._meta.fields + Owner._meta.fields
+                        if field.name in HOUSE_FIELDS + OWNER_FIELDS}
+
+    def run(self, rows):
+        rows = iter(rows)
+        house_ids = set()
+        owner_ids = set()
+        with transaction.atomic():
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if not chunk:
+                    break
+                houses, owners = self._import_chunk(chunk)
+                house_ids.update(houses)
+                owner_ids.update(owners)
+
+            if self.dry_run:
+                transaction.set_rollback(True)
+            else:
+                # bulk_create skips the signals keeping search and labels in sync
+                refresh_houses(house_ids, owner_ids)
+        return self
+
+    def _clean(self, name, value):
+        field = self._fields[name]
+        value = (value or '').strip()
+        if not value and field.blank:
+            return field.get_default() if field.has_default() else (None if field.null else '')
+        try:
+            return field.clean(value, None)
+        except ValidationError as e:
+            raise ValidationError(f"{name}: {' '.join(e.messages)}")
+
+    def _load_owners(self, chunk):
+        lookups = {key: set() for key in OWNER_KEYS}
+        for _, row in chunk:
+            for key in OWNER_KEYS:
+                value = (row.get(key) or '').strip()
+                if value and (key, value) not in self._owners:
+                    lookups[key].add(value)
+
+        query = Q()
+        for key, values in lookups.items():
+            if values:
+                query |= Q(**{f'{key}__in': values})
+        if not query:
+            return
+        for owner in Owner.objects.filter(query).only('id', *OWNER_IDENTITY):
+            for key in OWNER_KEYS:
+                self._owners.setdefault((key, getattr(owner, key)), owner)
+
+    def _load_houses(self, chunk):
+        numbers = {(row.get('hse_number') or '').strip() for _, row in chunk} - {''}
+        self._house_numbers.update(
+            House.objects.filter(hse_number__in=numbers).values_list('hse_number', flat=True)
+        )
+
+    def _import_chunk(self, chunk):
+        self._load_houses(chunk)
+        self._load_owners(chunk)
+
+        houses = []
+        owners = []
+        links = []
+        for line_number, row in chunk:
+            try:
+                house, owner, created = self._build_row(row)
+            except ValidationError as e:
+                self.errors.append({
+                    'line': line_number,
+                    'hse_number': (row.get('hse_number') or '').strip(),
+                    'error': ' '.join(e.messages),
+                })
+                continue
+            houses.append(house)
+            if owner is not None:
+                links.append((owner, house))
+                if created:
+                    owners.append(owner)
+                else:
+                    self.owners_matched += 1
+
+        House.objects.bulk_create(houses, batch_size=self.chunk_size)
+        Owner.objects.bulk_create(owners, batch_size=self.chunk_size)
+        Owner.house.through.objects.bulk_create(
+            [Owner.house.through(owner_id=owner.pk, house_id=house.pk) for owner, house in links],
+            batch_size=self.chunk_size,
+            ignore_conflicts=True,
+        )
+        self.houses_created += len(houses)
+        self.owners_created += len(owners)
+        return (
+            [house.pk for house in houses],
+            [owner.pk for owner, _ in links],
+        )
+
+    def _build_row(self, row):
+        values = {name: self._clean(name, row.get(name)) for name in HOUSE_FIELDS if name != 'status'}
+        if values['hse_number'] in self._house_numbers:
+            raise ValidationError(f"House {values['hse_number']} already exists")
+
+        status = self._clean('status', row.get('status')) if (row.get('status') or '').strip() else None
+        owner, created = self._match_owner(row)
+        house = House(status=status or ('owned' if owner else 'developer'), **values)
+        self._house_numbers.add(house.hse_number)
+        return house, owner, created
+
+    def _match_owner(self, row):
+        keys = {key: (row.get(key) or '').strip() for key in OWNER_KEYS}
+        if not any(keys.values()) and not (row.get('first_name') or '').strip():
+            return None, False
+
+        matches = []
+        for key, value in keys.items():
+            owner = self._owners.get((key, value))
+            if owner is not None and not any(owner is match for match in matches):
+                matches.append(owner)
+        if len(matches) > 1:
+            raise ValidationError('KRA PIN, phone number and email belong to different owners')
+        if matches:
+            owner = matches.pop()
+            self._check_identity(owner, row)
+            return owner, False
+
+        owner = Owner(
+            created_by=self.created_by,
+            **{name: self._clean(name, row.get(name)) for name in OWNER_FIELDS}
+        )
+        for key in OWNER_KEYS:
+            self._owners[(key, getattr(owner, key))] = owner
+        return owner, True
+
+    def _check_identity(self, owner, row):
+        """Refuse to link a matched owner whose details differ from the row's"""
+        conflicts = []
+        for name in OWNER_IDENTITY:
+            if not (row.get(name) or '').strip():
+                continue
+            value = self._clean(name, row.get(name))
+            current = getattr(owner, name)
+            if name == 'email':
+                value, current = value.lower(), (current or '').lower()
+            if value != current:
+                conflicts.append(f'{self._fields[name].verbose_name} {getattr(owner, name)}')
+        if conflicts:
+            raise ValidationError(f"Matched owner {owner.get_full_name()} has {', '.join(conflicts)}")
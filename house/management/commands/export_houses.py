@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ems.exports import CHUNK_SIZE, write_csv
+from house.exporters import HOUSE_EXPORT_HEADER, house_rows
+
+
+class Command(BaseCommand):
+    help = 'Export the house register with owners as CSV, in the format import_houses reads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file to write')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Rows fetched per database round trip')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], 'w', encoding='utf-8', newline='') as stream:
+                written = write_csv(stream, HOUSE_EXPORT_HEADER, house_rows(options['chunk_size']))
+        except OSError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(f"Exported {written} house rows to {options['path']}."))
@@ -0,0 +1,40 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from ems.imports import UnreadableFile, read_csv_rows
+from house.importers import CHUNK_SIZE, HouseImporter
+
+
+class Command(BaseCommand):
+    help = 'Bulk import houses and their owners from a CSV file'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='CSV with hse_number, unit_type, optional status and handover, and optional owner columns '
+                 '(first_name, middle_name, last_name, email, phone_number, kra_pin, address, nationality)'
+        )
+        parser.add_argument('--user', required=True, help='Username recorded as creator of new owners')
+        parser.add_argument('--dry-run', action='store_true', help='Validate and report conflicts without saving')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']} does not exist")
+
+        try:
+            with open(options['path'], encoding='utf-8-sig', newline='') as stream:
+                importer = HouseImporter(user, chunk_size=options['chunk_size'], dry_run=options['dry_run'])
+                importer.run(read_csv_rows(stream))
+        except (OSError, UnreadableFile) as e:
+            raise CommandError(str(e))
+
+        for error in importer.errors:
+            self.stderr.write(f"Line {error['line']} ({error['hse_number']}): {error['error']}")
+        prefix = 'Dry run: would import' if importer.dry_run else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f'{prefix} {importer.houses_created} houses, {importer.owners_created} new owners, '
+            f'{importer.owners_matched} matched to existing owners, {len(importer.errors)} rows rejected.'
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from house.models import House
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the current tenancy pointer of every house from the open tenancies'
+
+    def handle(self, *args, **options):
+        houses = House.objects.all().rebuild_current_tenancies()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt current tenancies for {houses} houses.'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from house.models import House, Owner
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalized display labels of every house and owner'
+
+    def handle(self, *args, **options):
+        houses = House.objects.all().rebuild_display_labels()
+        owners = Owner.objects.all().rebuild_display_labels()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt display labels for {houses} houses and {owners} owners.'
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from house.search import rebuild_documents
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the search documents of every house from its details and owners'
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_documents()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt search documents for {rebuilt} houses.'))
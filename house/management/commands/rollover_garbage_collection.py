@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from house.garbage import current_period, rollover
+
+
+class Command(BaseCommand):
+    help = 'Reset paper bin collection status of houses not yet collected this month (run daily from cron)'
+
+    def handle(self, *args, **options):
+        reset = rollover()
+        self.stdout.write(self.style.SUCCESS(
+            f'Reset {reset} houses for collection month {current_period():%Y-%m}.'
+        ))
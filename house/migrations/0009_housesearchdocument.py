@@ -0,0 +1,65 @@
+# Generated by Django 4.2.16 on 2026-10-18 02:11
+
+import django.db.models.deletion
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+
+FTS_TABLE = 'house_search_fts'
+
+
+def create_search_index(apps, schema_editor):
+    House = apps.get_model('house', 'House')
+    HouseSearchDocument = apps.get_model('house', 'HouseSearchDocument')
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'postgresql':
+        schema_editor.add_index(HouseSearchDocument, GinIndex(
+            SearchVector('document', config='simple'), name='house_search_tsv_idx'
+        ))
+        schema_editor.add_index(HouseSearchDocument, GinIndex(
+            OpClass('document', name='gin_trgm_ops'), name='house_search_trgm_idx'
+        ))
+    elif vendor == 'sqlite':
+        schema_editor.execute(f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(document)')
+
+    documents = []
+    for house in House.objects.prefetch_related('owner_set'):
+        parts = [house.hse_number, house.unit_type, house.status]
+        for owner in house.owner_set.all():
+            parts += [owner.first_name, owner.last_name, owner.email, owner.phone_number, owner.kra_pin]
+        documents.append(HouseSearchDocument(
+            house=house, document=' '.join(part for part in parts if part).lower()
+        ))
+    HouseSearchDocument.objects.bulk_create(documents, batch_size=1000)
+    if vendor == 'sqlite':
+        with schema_editor.connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, document) VALUES (%s, %s)',
+                [(document.house_id, document.document) for document in documents]
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('house', '0008_house_garbage_collected_and_more'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.CreateModel(
+            name='HouseSearchDocument',
+            fields=[
+                ('house', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='house.house')),
+                ('document', models.TextField()),
+            ],
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+def create_prefix_index(apps, schema_editor):
+    # Matches the UPPER(hse_number::text) LIKE UPPER(...) of istartswith;
+    # SQLite walks the unique hse_number index in order instead
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX house_number_prefix_idx ON house_house '
+            '(UPPER(hse_number::text) text_pattern_ops)'
+        )
+
+
+def drop_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS house_number_prefix_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('house', '0009_housesearchdocument'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_index, drop_prefix_index),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.16 on 2026-10-18 02:15
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Concat
+
+
+def populate_display_labels(apps, schema_editor):
+    House = apps.get_model('house', 'House')
+    Owner = apps.get_model('house', 'Owner')
+    owner = Owner.objects.filter(house=OuterRef('pk')).order_by('-created_at').annotate(
+        name=Concat('first_name', Value(' '), 'last_name')
+    )
+    House.objects.update(display_label=Concat(
+        Value('House '), 'hse_number', Value(' - '),
+        Coalesce(Subquery(owner.values('name')[:1]), Value('Vacant')),
+        output_field=models.CharField()
+    ))
+    house = House.objects.filter(owner_set=OuterRef('pk')).order_by('hse_number')
+    Owner.objects.update(display_label=Concat(
+        'first_name', Value(' '), 'last_name', Value(' - House: '),
+        Coalesce(Subquery(house.values('hse_number')[:1]), Value('No House')),
+        output_field=models.CharField()
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('house', '0010_house_number_prefix_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='house',
+            name='display_label',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='owner',
+            name='display_label',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.RunPython(populate_display_labels, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.16 on 2026-10-18 02:16
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def log_current_collections(apps, schema_editor):
+    # Houses already marked collected start the log for their month
+    House = apps.get_model('house', 'House')
+    GarbageCollection = apps.get_model('house', 'GarbageCollection')
+    GarbageCollection.objects.bulk_create([
+        GarbageCollection(house_id=pk, period=collected_on.replace(day=1))
+        for pk, collected_on in House.objects.filter(
+            garbage_collected=True, garbage_collection_date__isnull=False
+        ).values_list('pk', 'garbage_collection_date')
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('house', '0011_display_label'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GarbageCollection',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.DateField(help_text='First day of the collection month')),
+                ('collected_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('collected_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ('house', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='garbage_collections', to='house.house')),
+            ],
+            options={
+                'ordering': ['-period', 'house'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='garbagecollection',
+            constraint=models.UniqueConstraint(fields=('house', 'period'), name='unique_garbage_collection_per_month'),
+        ),
+        migrations.RunPython(log_current_collections, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-18 02:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('house', '0012_garbagecollection'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='owner',
+            index=models.Index(fields=['-created_at', '-id'], name='owner_latest_idx'),
+        ),
+    ]
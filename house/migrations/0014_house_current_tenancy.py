@@ -0,0 +1,29 @@
+# Generated by Django 4.2.16 on 2026-10-18 02:44
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def populate_current_tenancies(apps, schema_editor):
+    House = apps.get_model('house', 'House')
+    Tenancy = apps.get_model('tenant', 'Tenancy')
+    current = Tenancy.objects.filter(house=OuterRef('pk'), end_date__isnull=True)
+    House.objects.update(current_tenancy=Subquery(current.values('pk')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenant', '0003_tenancy_unique_current_tenancy_per_house'),
+        ('house', '0013_owner_latest_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='house',
+            name='current_tenancy',
+            field=models.OneToOneField(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='tenant.tenancy'),
+        ),
+        migrations.RunPython(populate_current_tenancies, migrations.RunPython.noop),
+    ]
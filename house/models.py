@@ -1,7 +1,42 @@
 from django.db import models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Concat
 from django.contrib.auth.models import User
 from django.utils import timezone
 
+class HouseQuerySet(models.QuerySet):
+    def available(self):
+        """Houses without a current tenancy, read from the maintained pointer"""
+        return self.filter(current_tenancy__isnull=True)
+
+    def rebuild_current_tenancies(self):
+        """Point every house at its open tenancy, if any, in a single UPDATE"""
+        from tenant.models import Tenancy
+
+        current = Tenancy.objects.filter(house=OuterRef('pk'), end_date__isnull=True)
+        return self.update(current_tenancy=Subquery(current.values('pk')[:1]))
+
+    def rebuild_display_labels(self):
+        """Recompute the denormalized display labels in a single UPDATE"""
+        owner = Owner.objects.filter(house=OuterRef('pk')).annotate(
+            name=Concat('first_name', Value(' '), 'last_name')
+        )
+        return self.update(display_label=Concat(
+            Value('House '), 'hse_number', Value(' - '),
+            Coalesce(Subquery(owner.values('name')[:1]), Value('Vacant')),
+            output_field=models.CharField()
+        ))
+
+class OwnerQuerySet(models.QuerySet):
+    def rebuild_display_labels(self):
+        """Recompute the denormalized display labels in a single UPDATE"""
+        house = House.objects.filter(owner_set=OuterRef('pk')).order_by('hse_number')
+        return self.update(display_label=Concat(
+            'first_name', Value(' '), 'last_name', Value(' - House: '),
+            Coalesce(Subquery(house.values('hse_number')[:1]), Value('No House')),
+            output_field=models.CharField()
+        ))
+
 class House(models.Model):
     STATUS_CHOICES = [
         ('vacant', 'Vacant'),
@@ -32,10 +67,36 @@ class House(models.Model):
         'Last Garbage Collection Date',
         null=True
     )
+    # "House <number> - <current owner>", maintained by house.signals so
+    # rendering a house never queries its owners
+    display_label = models.CharField(max_length=255, blank=True, editable=False)
+    # Open tenancy of the house, maintained by Tenancy.save so availability
+    # is a column filter instead of a subquery over every tenancy
+    current_tenancy = models.OneToOneField(
+        'tenant.Tenancy',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+'
+    )
+
+    # Kept in step with UPDATEs by the code maintaining them, so a full save
+    # of an instance loaded earlier must not write back stale values
+    DENORMALIZED_FIELDS = {'display_label', 'current_tenancy'}
+
+    objects = HouseQuerySet.as_manager()
 
     def __str__(self):
-        owner = self.owner_set.first()  # Get the first owner if exists
-        return f"House {self.hse_number} - {owner.get_full_name() if owner else 'Vacant'}"
+        return self.display_label or f"House {self.hse_number}"
+
+    def save(self, *args, **kwargs):
+        if not args and not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.DENORMALIZED_FIELDS
+            ]
+        super().save(*args, **kwargs)
 
     class Meta:
         ordering = ['hse_number']
@@ -63,13 +124,16 @@ class Owner(models.Model):
     )
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
+    # "<name> - House: <first house>", maintained by house.signals
+    display_label = models.CharField(max_length=255, blank=True, editable=False)
+
+    objects = OwnerQuerySet.as_manager()
 
     def get_full_name(self):
         return f"{self.first_name} {self.last_name}"
     
     def __str__(self):
-        house = self.house.first()  # Get first house if exists
-        return f"{self.get_full_name()} - House: {house.hse_number if house else 'No House'}"
+        return self.display_label or self.get_full_name()
     
     
 
@@ -77,4 +141,32 @@ class Owner(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Owner'
         verbose_name_plural = 'Owners'
-        
\ No newline at end of file
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='owner_latest_idx'),
+        ]
+        
+class HouseSearchDocument(models.Model):
+    """Precomputed search text of a house and its owners, see house.search"""
+    house = models.OneToOneField(
+        House,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_document'
+    )
+    document = models.TextField()
+
+class GarbageCollection(models.Model):
+    """Paper bin collection of a house in a month, see house.garbage"""
+    house = models.ForeignKey(House, on_delete=models.CASCADE, related_name='garbage_collections')
+    period = models.DateField(help_text='First day of the collection month')
+    collected_at = models.DateTimeField(default=timezone.now)
+    collected_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.house} - {self.period:%Y-%m}"
+
+    class Meta:
+        ordering = ['-period', 'house']
+        constraints = [
+            models.UniqueConstraint(fields=['house', 'period'], name='unique_garbage_collection_per_month'),
+        ]
@@ -0,0 +1,108 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db import connection, transaction
+from django.db.models import Prefetch, Q
+from django.db.models.expressions import RawSQL
+
+from .models import House, HouseSearchDocument, Owner
+
+# SQLite keeps a copy of the documents in an FTS5 table keyed by house id
+FTS_TABLE = 'house_search_fts'
+SEARCH_CONFIG = 'simple'
+
+
+def document_vector():
+    """Expression the PostgreSQL full text index is built on"""
+    return SearchVector('document', config=SEARCH_CONFIG)
+
+
+def build_document(house, owners):
+    """Lowercased search text of a house and its owners"""
+    parts = [house.hse_number, house.unit_type, house.status]
+    for owner in owners:
+        parts += [owner.first_name, owner.last_name, owner.email, owner.phone_number, owner.kra_pin]
+    return ' '.join(part for part in parts if part).lower()
+
+
+def update_documents(house_ids):
+    """Rebuild the search documents of the given houses.
+
+    Houses and their owners are read in two queries and the documents are
+    replaced in bulk, so keeping the index in sync costs the same for one
+    house or a whole import.
+    """
+    house_ids = set(house_ids)
+    if not house_ids:
+        return
+    houses = House.objects.filter(pk__in=house_ids).only(
+        'id', 'hse_number', 'unit_type', 'status'
+    ).prefetch_related(
+        Prefetch(
+            'owner_set',
+            queryset=Owner.objects.only('id', 'first_name', 'last_name', 'email', 'phone_number', 'kra_pin'),
+            to_attr='search_owners'
+        )
+    )
+    documents = [
+        HouseSearchDocument(house=house, document=build_document(house, house.search_owners))
+        for house in houses
+    ]
+
+    with transaction.atomic():
+        HouseSearchDocument.objects.filter(house_id__in=house_ids).delete()
+        HouseSearchDocument.objects.bulk_create(documents, batch_size=1000)
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(pk,) for pk in house_ids]
+                )
+                cursor.executemany(
+                    f'INSERT INTO {FTS_TABLE} (rowid, document) VALUES (%s, %s)',
+                    [(document.house_id, document.document) for document in documents]
+                )
+
+
+def rebuild_documents(batch_size=2000):
+    """Rebuild the search documents of every house. Returns the number of houses"""
+    house_ids = list(House.objects.values_list('pk', flat=True))
+    for start in range(0, len(house_ids), batch_size):
+        update_documents(house_ids[start:start + batch_size])
+    return len(house_ids)
+
+
+def fts_query(query):
+    """FTS5 MATCH expression requiring every term, each as a prefix"""
+    terms = re.findall(r'\w+', query.lower())
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def search_houses(queryset, query):
+    """Filter a House queryset to the houses matching a search query.
+
+    PostgreSQL matches whole words through the tsvector index and
+    fragments (partial house numbers, phone numbers) through the trigram
+    index; SQLite uses the FTS5 table with prefix terms. Both are index
+    lookups, so the cost depends on the number of matches rather than the
+    size of the estate.
+    """
+    query = query.strip()
+    if not query:
+        return queryset
+
+    if connection.vendor == 'postgresql':
+        matches = HouseSearchDocument.objects.annotate(vector=document_vector()).filter(
+            Q(vector=SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch'))
+            | Q(document__contains=query.lower())
+        ).values('house_id')
+        return queryset.filter(pk__in=matches)
+
+    if connection.vendor == 'sqlite':
+        match = fts_query(query)
+        if not match:
+            return queryset.none()
+        return queryset.filter(pk__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match]))
+
+    return queryset.filter(pk__in=HouseSearchDocument.objects.filter(
+        document__contains=query.lower()
+    ).values('house_id'))
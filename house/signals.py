@@ -0,0 +1,74 @@
+from django.db import connection
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import House, Owner
+from .search import FTS_TABLE, update_documents
+
+
+def refresh_houses(house_ids=(), owner_ids=()):
+    """Bring search documents and display labels of houses and owners up to date"""
+    house_ids = set(house_ids)
+    owner_ids = set(owner_ids)
+    if house_ids:
+        update_documents(house_ids)
+        House.objects.filter(pk__in=house_ids).rebuild_display_labels()
+    if owner_ids:
+        Owner.objects.filter(pk__in=owner_ids).rebuild_display_labels()
+
+
+@receiver(post_save, sender=House)
+def index_house(sender, instance, created, **kwargs):
+    owner_ids = [] if created else instance.owner_set.values_list('pk', flat=True)
+    refresh_houses([instance.pk], owner_ids)
+    instance.refresh_from_db(fields=['display_label'])
+
+
+@receiver(pre_delete, sender=House)
+def remember_house_owners(sender, instance, **kwargs):
+    instance._label_owner_ids = list(instance.owner_set.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=House)
+def unindex_house(sender, instance, **kwargs):
+    # The document row cascades, the SQLite FTS copy does not
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [instance.pk])
+    refresh_houses(owner_ids=getattr(instance, '_label_owner_ids', []))
+
+
+@receiver(post_save, sender=Owner)
+def index_owner_houses(sender, instance, created, **kwargs):
+    house_ids = [] if created else instance.house.values_list('pk', flat=True)
+    refresh_houses(house_ids, [instance.pk])
+    instance.refresh_from_db(fields=['display_label'])
+
+
+@receiver(pre_delete, sender=Owner)
+def remember_owner_houses(sender, instance, **kwargs):
+    instance._search_house_ids = list(instance.house.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Owner)
+def reindex_owner_houses(sender, instance, **kwargs):
+    refresh_houses(getattr(instance, '_search_house_ids', []))
+
+
+@receiver(m2m_changed, sender=Owner.house.through)
+def reindex_owner_links(sender, instance, action, reverse, pk_set, **kwargs):
+    # instance is the owner, or the house when changed through house.owner_set
+    related = instance.owner_set if reverse else instance.house
+    if action == 'pre_clear':
+        instance._cleared_ids = list(related.values_list('pk', flat=True))
+        return
+    if action == 'post_clear':
+        pk_set = getattr(instance, '_cleared_ids', [])
+    elif action not in ('post_add', 'post_remove'):
+        return
+
+    if reverse:
+        refresh_houses([instance.pk], pk_set)
+    else:
+        refresh_houses(pk_set, [instance.pk])
+    instance.refresh_from_db(fields=['display_label'])
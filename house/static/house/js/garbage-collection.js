@@ -0,0 +1,41 @@
+/**
+ * Paper bin toggle submitted in the background
+ */
+
+'use strict';
+
+document.addEventListener('DOMContentLoaded', function () {
+  document.querySelectorAll('form[data-garbage-toggle]').forEach(function (form) {
+    form.addEventListener('submit', function (event) {
+      event.preventDefault();
+      const button = document.querySelector(form.dataset.garbageToggle);
+      const modal = bootstrap.Modal.getInstance(form.closest('.modal'));
+
+      fetch(form.action, {
+        method: 'POST',
+        body: new FormData(form),
+        headers: { Accept: 'application/json' }
+      })
+        .then(function (response) {
+          if (!response.ok) {
+            throw new Error(response.statusText);
+          }
+          return response.json();
+        })
+        .then(function (data) {
+          button.classList.toggle('btn-label-success', data.garbage_collected);
+          button.classList.toggle('btn-label-danger', !data.garbage_collected);
+          button.textContent = data.garbage_collected ? 'Paper Bin Collected' : 'Collect Paper Bin';
+          form.querySelector('.garbage-question').textContent = data.garbage_collected
+            ? 'Are you sure you want to mark paper bin as uncollected?'
+            : 'Confirm Paper Bin collection for this house?';
+          if (modal) {
+            modal.hide();
+          }
+        })
+        .catch(function () {
+          form.submit();
+        });
+    });
+  });
+});
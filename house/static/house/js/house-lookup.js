@@ -0,0 +1,25 @@
+/**
+ * House pickers loading their options from the house lookup endpoint
+ */
+
+'use strict';
+
+$(function () {
+  $('select.house-lookup').each(function () {
+    var $this = $(this);
+    $this.wrap('<div class="position-relative"></div>').select2({
+      placeholder: 'Type a house number',
+      allowClear: !$this.prop('multiple'),
+      dropdownParent: $this.parent(),
+      minimumInputLength: 0,
+      ajax: {
+        url: $this.data('lookup-url'),
+        dataType: 'json',
+        delay: 250,
+        data: function (params) {
+          return { q: params.term || '' };
+        }
+      }
+    });
+  });
+});
@@ -1,3 +1,176 @@
-from django.test import TestCase
+from datetime import date, datetime, timezone as dt_timezone
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ems.pagination import encode_cursor
+from tenant.models import Tenancy, Tenant
+
+from .garbage import mark_collected, rollover
+from .importers import HouseImporter
+from .models import GarbageCollection, House, Owner
+from .views import HouseListView
+
+
+@override_settings(TIME_ZONE='Africa/Nairobi')
+class GarbageCollectionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='collector')
+        self.house = House.objects.create(hse_number='A1', unit_type='2BR')
+
+    def test_collection_after_local_midnight_belongs_to_the_new_month(self):
+        # 22:00 UTC on 31 October is 01:00 on 1 November in Nairobi
+        with mock.patch('django.utils.timezone.now', return_value=datetime(2026, 10, 31, 22, tzinfo=dt_timezone.utc)):
+            self.assertEqual(mark_collected(House.objects.all(), self.user), 1)
+
+        self.house.refresh_from_db()
+        self.assertEqual(self.house.garbage_collection_date, date(2026, 11, 1))
+        self.assertEqual(GarbageCollection.objects.get(house=self.house).period, date(2026, 11, 1))
+        self.assertEqual(rollover(date(2026, 11, 1)), 0)
+        self.house.refresh_from_db()
+        self.assertTrue(self.house.garbage_collected)
+
+
+    def test_rollover_resets_houses_collected_in_earlier_months(self):
+        with mock.patch('django.utils.timezone.now', return_value=datetime(2026, 10, 15, 9, tzinfo=dt_timezone.utc)):
+            mark_collected(House.objects.all(), self.user)
+        recent = House.objects.create(hse_number='A2', unit_type='2BR')
+        with mock.patch('django.utils.timezone.now', return_value=datetime(2026, 11, 2, 9, tzinfo=dt_timezone.utc)):
+            mark_collected(House.objects.filter(pk=recent.pk), self.user)
+
+        self.assertEqual(rollover(date(2026, 11, 5)), 1)
+        self.assertEqual(rollover(date(2026, 11, 5)), 0)
+        self.assertEqual(
+            dict(House.objects.values_list('hse_number', 'garbage_collected')), {'A1': False, 'A2': True}
+        )
+        # The October collection stays in the log
+        self.assertEqual(GarbageCollection.objects.filter(house=self.house, period=date(2026, 10, 1)).count(), 1)
+
+
+class HouseSaveTests(TestCase):
+    def test_full_save_of_a_stale_house_keeps_the_maintained_fields(self):
+        House.objects.create(hse_number='A1', unit_type='2BR')
+        stale = House.objects.get(hse_number='A1')
+
+        tenant = Tenant.objects.create(first_name='Jane', last_name='Doe', phone_number='0700000000', id_cardnumber=1)
+        tenancy = Tenancy.objects.create(tenant=tenant, house=stale)
+        owner = Owner.objects.create(
+            first_name='John', last_name='Kamau', email='john@example.com',
+            phone_number='0700000001', kra_pin='A001', address='Nairobi', nationality='Kenyan',
+        )
+        owner.house.add(stale)
+
+        stale.status = 'owned'
+        stale.save()
+
+        house = House.objects.get(pk=stale.pk)
+        self.assertEqual(house.status, 'owned')
+        self.assertEqual(house.current_tenancy, tenancy)
+        self.assertEqual(house.display_label, 'House A1 - John Kamau')
+
+
+class HouseImporterTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='importer')
+        self.owner = Owner.objects.create(
+            first_name='Jane', last_name='Wanjiru', email='jane@example.com',
+            phone_number='0700000001', kra_pin='A001', address='Nairobi', nationality='Kenyan',
+        )
+
+    def row(self, **owner):
+        return {'hse_number': 'B1', 'unit_type': '2BR', 'first_name': 'Jane', 'last_name': 'Wanjiru',
+                'phone_number': '0700000001', **owner}
+
+    def test_row_matching_an_owner_is_linked_to_it(self):
+        importer = HouseImporter(self.user).run([(2, self.row(email='JANE@example.com'))])
+
+        self.assertEqual(importer.errors, [])
+        self.assertEqual(importer.owners_matched, 1)
+        self.assertQuerySetEqual(self.owner.house.all(), ['B1'], transform=lambda house: house.hse_number)
+
+    def test_owner_with_different_details_is_a_conflict(self):
+        for dry_run in (True, False):
+            with self.subTest(dry_run=dry_run):
+                importer = HouseImporter(self.user, dry_run=dry_run).run(
+                    [(2, self.row(first_name='John', email='john@example.com'))]
+                )
+
+                self.assertEqual(importer.houses_created, 0)
+                self.assertEqual(importer.owners_matched, 0)
+                self.assertEqual(len(importer.errors), 1)
+                self.assertIn('first name Jane', importer.errors[0]['error'])
+                self.assertIn('email jane@example.com', importer.errors[0]['error'])
+                self.assertFalse(House.objects.exists())
+
+
+class HouseListPaginationTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create(username='staff'))
+        for number in ['A01', 'A02', 'A03', 'A04', 'A05', 'B01', 'B02']:
+            House.objects.create(hse_number=number, unit_type='2BR')
+        patcher = mock.patch.object(HouseListView, 'paginate_by', 2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def page(self, querystring=''):
+        response = self.client.get(reverse('house-list') + querystring)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def numbers(self, response):
+        return [house.hse_number for house in response.context['houses']]
+
+    def test_first_page_has_no_previous_link(self):
+        response = self.page()
+        self.assertEqual(self.numbers(response), ['A01', 'A02'])
+        self.assertIsNone(response.context['previous_url'])
+        self.assertEqual(response.context['page_obj'].total, 7)
+
+    def test_next_and_previous_links_walk_the_list(self):
+        second = self.page(self.page().context['next_url'])
+        self.assertEqual(self.numbers(second), ['A03', 'A04'])
+
+        third = self.page(second.context['next_url'])
+        self.assertEqual(self.numbers(third), ['A05', 'B01'])
+        self.assertEqual(self.numbers(self.page(third.context['previous_url'])), ['A03', 'A04'])
+
+        back = self.page(second.context['previous_url'])
+        self.assertEqual(self.numbers(back), ['A01', 'A02'])
+        self.assertIsNone(back.context['previous_url'])
+
+    def test_last_page_has_no_next_link(self):
+        last = self.page(self.page().context['last_url'])
+        self.assertEqual(self.numbers(last), ['B01', 'B02'])
+        self.assertIsNone(last.context['next_url'])
+        self.assertEqual(self.numbers(self.page(last.context['previous_url'])), ['A04', 'A05'])
+
+        after_last = self.page(f"?after={encode_cursor(['B02'])}")
+        self.assertEqual(self.numbers(after_last), [])
+        self.assertIsNone(after_last.context['next_url'])
+
+    def test_invalid_cursor_is_not_found(self):
+        for querystring in [
+            '?after=not-a-cursor!',
+            f"?after={encode_cursor(['A01', 1])}",  # Does not match the ordering
+            f"?before={encode_cursor({'hse_number': 'A01'})}",
+            '?after=eyJh',  # Truncated JSON
+        ]:
+            with self.subTest(querystring=querystring):
+                response = self.client.get(reverse('house-list') + querystring)
+                self.assertEqual(response.status_code, 404)
+
+    def test_page_links_keep_the_search_encoded(self):
+        response = self.page('?search=A&note=x%26y%3Dz')
+        self.assertEqual(self.numbers(response), ['A01', 'A02'])
+
+        next_url = response.context['next_url']
+        params = QueryDict(next_url[1:])
+        self.assertEqual(params['search'], 'A')
+        self.assertEqual(params['note'], 'x&y=z')
+        self.assertEqual(self.numbers(self.page(next_url)), ['A03', 'A04'])
+        last = self.page(response.context['last_url'])
+        self.assertEqual(self.numbers(last), ['A04', 'A05'])
+        self.assertEqual(QueryDict(last.context['first_url'][1:]).dict(), {'search': 'A', 'note': 'x&y=z'})
@@ -4,6 +4,9 @@ from . import views
 urlpatterns = [
     # House URLs
     path('houses/', views.HouseListView.as_view(), name='house-list'),
+    path('houses/lookup/', views.HouseLookupView.as_view(), name='house-lookup'),
+    path('houses/import/', views.HouseImportView.as_view(), name='house-import'),
+    path('houses/export/', views.HouseExportView.as_view(), name='house-export'),
     path('house/new/', views.HouseCreateView.as_view(), name='house-create'),
     path('house/<int:pk>/', views.HouseDetailView.as_view(), name='house-detail'),
     path('house/<int:pk>/update/', views.HouseUpdateView.as_view(), name='house-update'),
@@ -17,6 +20,7 @@ urlpatterns = [
     
     # Garbageurl
     path('house/<int:pk>/garbage-collection/', views.GarbageCollectionUpdateView.as_view(), name='garbage-collection'),
+    path('houses/garbage-collection/', views.GarbageCollectionBulkView.as_view(), name='garbage-collection-bulk'),
     
     # resetgarbagestatuseachmonth
     path('reset-garbage/', views.ResetGarbageCollectionView.as_view(), name='reset-garbage'),
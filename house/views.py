@@ -1,18 +1,27 @@
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView, DetailView, View
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.urls import reverse_lazy
-from django.utils import timezone
 from django.shortcuts import redirect
 from django.contrib import messages
-from django.db.models import Q
+from django.db.models import Count, Exists, OuterRef, Prefetch, Q, Subquery, Value
+from django.db.models.functions import Concat
+from django.http import JsonResponse
+from django.utils import timezone
+from ems.exports import csv_response
+from ems.imports import UnreadableFile, open_upload, read_csv_rows
+from ems.pagination import KeysetPaginationMixin
 from .models import House, Owner
-from .forms import HouseForm, OwnerForm
+from .forms import HouseForm, HouseImportForm, OwnerForm
+from .exporters import HOUSE_EXPORT_HEADER, house_rows
+from .garbage import current_period, mark_collected, toggle_collected
+from .importers import HouseImporter
+from .search import search_houses
 
-class HouseListView(LoginRequiredMixin, ListView):
+class HouseListView(LoginRequiredMixin, KeysetPaginationMixin, ListView):
     model = House
     template_name = 'house/house_list.html'
     context_object_name = 'houses'
-    ordering = ['hse_number']
+    keyset = ('hse_number',)
     paginate_by = 100
     
     def get_queryset(self):
@@ -20,51 +29,105 @@ class HouseListView(LoginRequiredMixin, ListView):
         search_query = self.request.GET.get('search')
         
         if search_query:
-            queryset = queryset.filter(
-                Q(hse_number__icontains=search_query) |
-                Q(owner_set__first_name__icontains=search_query) |
-                Q(owner_set__last_name__icontains=search_query) |
-                Q(owner_set__email__icontains=search_query) |
-                Q(owner_set__phone_number__icontains=search_query) |
-                Q(owner_set__kra_pin__icontains=search_query) |
-                Q(unit_type__icontains=search_query) |
-                Q(status__icontains=search_query)
-            ).distinct()
-            
-        return queryset
-    
+            queryset = search_houses(queryset, search_query)
+
+        # Only the columns the list shows, and the current owner of every house
+        # on the page in one extra query
+        return queryset.only('id', 'hse_number', 'unit_type', 'status', 'handover').prefetch_related(
+            Prefetch(
+                'owner_set',
+                queryset=Owner.objects.only('id', 'phone_number', 'email', 'nationality'),
+                to_attr='owners'
+            )
+        )
+
+    def get_total_count(self, queryset):
+        return self.stats['houses_count'], False  # Already counted with the stats
+
     def get_context_data(self, **kwargs):
+        # Status counters of the current filter in a single query
+        self.stats = self.object_list.aggregate(
+            houses_count=Count('pk'),
+            howned_count=Count('pk', filter=Q(status='owned')),
+            downed_count=Count('pk', filter=Q(status='developer')),
+            vhouse_count=Count('pk', filter=Q(status='vacant')),
+        )
         context = super().get_context_data(**kwargs)
-        
-        # Get filtered houses based on search
-        houses = self.get_queryset()
-        
-        # Total houses in current filter
-        context['houses_count'] = houses.count()
-        
-        # Houses with owners in current filter
-        context['howned_count'] = houses.filter(status='owned').count()
-        
-        # Developer houses in current filter
-        context['downed_count'] = houses.filter(status='developer').count()
-        
-        # Vacant houses in current filter
-        context['vhouse_count'] = houses.filter(status='vacant').count()
-        
+        context.update(self.stats)
+
         # Add search query to context for form
         context['search_query'] = self.request.GET.get('search', '')
-        
-        # Preserve search query in pagination links
-        search_query = self.request.GET.get('search', '')
-        context['search_query'] = search_query
-        
-        if search_query:
-            context['extra_url_params'] = f'&search={search_query}'
-        else:
-            context['extra_url_params'] = ''
 
         return context
 
+class HouseLookupView(LoginRequiredMixin, View):
+    """Typeahead for house pickers: top matches by house number prefix as JSON
+
+    Answers ?q=<prefix> with at most ?limit= houses ordered by house number,
+    with the current owner's name joined in the same query. ?available=1
+    restricts the matches to vacant houses and houses without an owner,
+    ?unlet=1 to houses without a current tenancy.
+    """
+    limit = 20
+    max_limit = 50
+
+    def get(self, request, *args, **kwargs):
+        try:
+            limit = min(int(request.GET.get('limit', self.limit)), self.max_limit)
+        except ValueError:
+            limit = self.limit
+
+        owner = Owner.objects.filter(house=OuterRef('pk')).annotate(
+            name=Concat('first_name', Value(' '), 'last_name')
+        )
+        houses = House.objects.filter(hse_number__istartswith=request.GET.get('q', '').strip())
+        if request.GET.get('available'):
+            houses = houses.filter(Q(status='vacant') | ~Exists(owner))
+        if request.GET.get('unlet'):
+            houses = houses.available()
+        houses = houses.annotate(owner_name=Subquery(owner.values('name')[:1])).order_by(
+            'hse_number'
+        ).values('id', 'hse_number', 'unit_type', 'owner_name')[:max(limit, 1)]
+
+        return JsonResponse({'results': [
+            {
+                'id': house['id'],
+                'text': f"{house['hse_number']} - {house['owner_name'] or house['unit_type']}",
+                'hse_number': house['hse_number'],
+                'owner': house['owner_name'],
+            }
+            for house in houses
+        ]})
+
+class HouseImportView(LoginRequiredMixin, View):
+    """Bulk upload of houses and their owners as CSV, answered with per-row errors"""
+
+    def post(self, request, *args, **kwargs):
+        form = HouseImportForm(request.POST, request.FILES)
+        if not form.is_valid():
+            return JsonResponse({'errors': form.errors}, status=400)
+
+        importer = HouseImporter(request.user, dry_run=form.cleaned_data['dry_run'])
+        try:
+            importer.run(read_csv_rows(open_upload(form.cleaned_data['file'])))
+        except UnreadableFile as e:
+            return JsonResponse({'errors': {'file': [str(e)]}}, status=400)
+
+        return JsonResponse({
+            'dry_run': importer.dry_run,
+            'houses_created': importer.houses_created,
+            'owners_created': importer.owners_created,
+            'owners_matched': importer.owners_matched,
+            'rejected': len(importer.errors),
+            'errors': importer.errors,
+        })
+
+class HouseExportView(LoginRequiredMixin, View):
+    """The house register with owners streamed as CSV in the import format"""
+
+    def get(self, request, *args, **kwargs):
+        return csv_response(f'houses-{timezone.localdate():%Y-%m-%d}.csv', HOUSE_EXPORT_HEADER, house_rows())
+
 class HouseCreateView(LoginRequiredMixin, CreateView):
     model = House
     form_class = HouseForm
@@ -87,9 +150,6 @@ class HouseDetailView(LoginRequiredMixin, DetailView):
         else:
             context['owner_form'] = OwnerForm()
         
-        # Add all houses for the dropdown
-        context['houses'] = House.objects.all()
-        
         search_query = self.request.GET.get('search', '')
         if search_query:
             context['extra_url_params'] = f'&search={search_query}'
@@ -119,7 +179,7 @@ class HouseDetailView(LoginRequiredMixin, DetailView):
             owner.house.clear()  # Remove any existing house associations
             owner.house.add(house)
             house.status = 'owned'
-            house.save()
+            house.save(update_fields=['status', 'updated_at'])
             
             messages.success(request, 'House owner updated successfully.')
             return redirect('house-detail', pk=house.pk)
@@ -154,14 +214,25 @@ class OwnerListView(LoginRequiredMixin, ListView):
     context_object_name = 'owners'
     ordering = ['-created_at']
     paginate_by = 10
-    
+
+    def get_queryset(self):
+        # Only the columns the list shows, with every owner's houses in one extra query
+        return super().get_queryset().only(
+            'id', 'first_name', 'last_name', 'email', 'phone_number', 'kra_pin', 'nationality'
+        ).prefetch_related(
+            Prefetch('house', queryset=House.objects.only('id', 'hse_number', 'unit_type'))
+        )
+
+    def get_paginator(self, *args, **kwargs):
+        paginator = super().get_paginator(*args, **kwargs)
+        paginator.count = self.total_owners  # Already counted for the card
+        return paginator
+
     def get_context_data(self, **kwargs):
+        self.total_owners = self.object_list.count()
         context = super().get_context_data(**kwargs)
-        context['houses'] = House.objects.filter(
-            Q(status='vacant') | Q(owner_set__isnull=True)
-        ).order_by('hse_number')
         context['form'] = OwnerForm()
-        context['total_owners'] = Owner.objects.count()
+        context['total_owners'] = self.total_owners
         return context
 
 class OwnerCreateView(LoginRequiredMixin, CreateView):
@@ -179,7 +250,7 @@ class OwnerCreateView(LoginRequiredMixin, CreateView):
             house = House.objects.get(id=house_id)
             self.object.house.add(house)
             house.status = 'owned'
-            house.save()
+            house.save(update_fields=['status', 'updated_at'])
             
         messages.success(self.request, 'Owner created successfully.')
         return response
@@ -205,11 +276,6 @@ class OwnerUpdateView(LoginRequiredMixin, UpdateView):
         messages.error(self.request, 'Error updating owner. Please check the form.')
         return super().form_invalid(form)
     
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['houses'] = House.objects.all()
-        return context
-
 class OwnerDeleteView(LoginRequiredMixin, DeleteView):
     model = Owner
     template_name = 'owners/owner_confirm_delete.html'
@@ -217,29 +283,60 @@ class OwnerDeleteView(LoginRequiredMixin, DeleteView):
 
     
 class GarbageCollectionUpdateView(LoginRequiredMixin, UpdateView):
+    """Toggle the paper bin collection of one house
+
+    Requests asking for JSON get the new status back instead of a redirect,
+    so crews can mark houses without reloading the page.
+    """
     model = House
     fields = []  # Empty since we're not using form fields directly
-    success_url = reverse_lazy('house-list')
-    
+
     def post(self, request, *args, **kwargs):
-        self.object = self.get_object()  # Set self.object
-        self.object.garbage_collected = not self.object.garbage_collected
+        self.object = toggle_collected(self.get_object(), request.user)
+
+        if 'application/json' in request.headers.get('Accept', ''):
+            return JsonResponse({
+                'id': self.object.pk,
+                'garbage_collected': self.object.garbage_collected,
+                'garbage_collection_date': self.object.garbage_collection_date,
+            })
         if self.object.garbage_collected:
-            self.object.garbage_collection_date = timezone.now()
-        self.object.save()
-        
-        messages.success(request, 'Paper bin collected.')
-        return redirect(self.get_success_url())
-    
-class ResetGarbageCollectionView(View):
+            messages.success(request, 'Paper bin collected.')
+        else:
+            messages.success(request, 'Paper bin marked as not collected.')
+        return redirect('house-detail', pk=self.object.pk)
+
+class GarbageCollectionBulkView(LoginRequiredMixin, View):
+    """Mark every house of a block (house number prefix) or a list of houses collected
+
+    POST block=<prefix> or house=<id> (repeated). Answers with the number of
+    houses newly marked for the current month.
+    """
+
+    def post(self, request, *args, **kwargs):
+        block = request.POST.get('block', '').strip()
+        house_ids = request.POST.getlist('house')
+        if not block and not house_ids:
+            return JsonResponse({'error': 'Give a block or at least one house'}, status=400)
+
+        houses = House.objects.all()
+        if block:
+            houses = houses.filter(hse_number__istartswith=block)
+        if house_ids:
+            houses = houses.filter(pk__in=[pk for pk in house_ids if pk.isdigit()])
+
+        marked = mark_collected(houses, request.user)
+        return JsonResponse({'marked': marked, 'period': f'{current_period():%Y-%m}'})
+
+class ResetGarbageCollectionView(LoginRequiredMixin, UserPassesTestMixin, View):
     def test_func(self):
         # Only allow superusers to access this view
         return self.request.user.is_superuser
     
-    def get(self, request, *args, **kwargs):
-        # Reset all houses to uncollected status
+    def post(self, request, *args, **kwargs):
+        # Reset all houses to uncollected status, the collection log is kept
         houses = House.objects.all()
         updated = houses.update(garbage_collected=False)
         
         messages.success(request, f'Successfully reset garbage collection status for {updated} houses.')
-        return redirect('house-list')
\ No newline at end of file
+        return redirect('house-list')
@@ -1,5 +1,12 @@
 from django.contrib import admin
-from .models import Meter, MeterReading
+from .models import Anomaly, Meter, MeterReading
 
 admin.site.register(Meter)
-admin.site.register(MeterReading)
\ No newline at end of file
+admin.site.register(MeterReading)
+
+
+@admin.register(Anomaly)
+class AnomalyAdmin(admin.ModelAdmin):
+    list_display = ['reading', 'kind', 'score', 'detected_at']
+    list_filter = ['kind']
+    raw_id_fields = ['reading']
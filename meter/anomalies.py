@@ -0,0 +1,98 @@
+import numpy as np
+from django.db import transaction
+from django.db.models import FloatField
+from django.db.models.functions import Cast
+
+from .models import Anomaly, AnomalyScan, MeterReading
+
+Z_THRESHOLD = 3.0
+MIN_HISTORY = 6
+ZERO_STREAK = 3
+BATCH_SIZE = 5000
+
+
+def load_series():
+    """All actual readings as NumPy arrays ordered by meter and date, from one query"""
+    rows = MeterReading.objects.filter(is_estimated=False).order_by('meter_id', 'reading_date', 'id').values_list(
+        'id',
+        'meter_id',
+        'meter__house__unit_type',
+        Cast('consumption', FloatField()),
+    )
+    ids, meter_ids, unit_types, consumption = zip(*rows) if rows else ((), (), (), ())
+    _, unit_codes = np.unique(np.array(unit_types, dtype=object).astype(str), return_inverse=True)
+    return (
+        np.array(ids, dtype=np.int64),
+        np.array(meter_ids, dtype=np.int64),
+        unit_codes.astype(np.int64),
+        np.array(consumption, dtype=np.float64),
+    )
+
+
+def group_zscores(groups, values, min_count):
+    """z-score of every value against the mean and deviation of its group"""
+    counts = np.bincount(groups)
+    sums = np.bincount(groups, weights=values)
+    squares = np.bincount(groups, weights=values * values)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = sums / counts
+        stds = np.sqrt(np.maximum(squares / counts - means * means, 0))
+        scores = (values - means[groups]) / stds[groups]
+    valid = (counts[groups] >= min_count) & (stds[groups] > 0)
+    return np.where(valid, scores, 0.0)
+
+
+def zero_streaks(meter_index, consumption):
+    """Length of the run of zero readings each reading belongs to so far"""
+    positions = np.arange(len(consumption))
+    is_zero = consumption == 0
+    new_meter = np.ones(len(consumption), dtype=bool)
+    new_meter[1:] = meter_index[1:] != meter_index[:-1]
+    # Last position before each reading that breaks a streak
+    boundary = np.where(~is_zero, positions, np.where(new_meter, positions - 1, -1))
+    last_boundary = np.maximum.accumulate(boundary)
+    return np.where(is_zero, positions - last_boundary, 0)
+
+
+def find_anomalies(meter_ids, unit_codes, consumption,
+                   z_threshold=Z_THRESHOLD, min_history=MIN_HISTORY, zero_streak=ZERO_STREAK):
+    """Vectorized checks over the whole estate.
+
+    Returns a dict of kind -> (mask, score) arrays aligned with the input.
+    """
+    _, meter_index = np.unique(meter_ids, return_inverse=True)
+    self_z = group_zscores(meter_index, consumption, min_history)
+    peer_z = group_zscores(unit_codes, consumption, min_history)
+    streaks = zero_streaks(meter_index, consumption)
+    return {
+        'self_zscore': (np.abs(self_z) > z_threshold, self_z),
+        'peer_zscore': (np.abs(peer_z) > z_threshold, peer_z),
+        'zero_streak': (streaks >= zero_streak, streaks.astype(np.float64)),
+        'negative': (consumption < 0, consumption),
+    }
+
+
+def detect_anomalies(full=False, **thresholds):
+    """Flag anomalous readings and store them as Anomaly rows.
+
+    Statistics are always computed over every reading so each house and
+    unit type is judged against its full history, but only readings newer
+    than the last scan are flagged unless full is set. Readings already
+    flagged for a kind are skipped. Returns the number of flags raised.
+    """
+    ids, meter_ids, unit_codes, consumption = load_series()
+    if not len(ids):
+        return 0
+
+    last_scan = None if full else AnomalyScan.objects.first()
+    scope = ids > last_scan.last_reading_id if last_scan else np.ones(len(ids), dtype=bool)
+
+    anomalies = []
+    for kind, (mask, scores) in find_anomalies(meter_ids, unit_codes, consumption, **thresholds).items():
+        for index in np.flatnonzero(mask & scope):
+            anomalies.append(Anomaly(reading_id=int(ids[index]), kind=kind, score=round(float(scores[index]), 3)))
+
+    with transaction.atomic():
+        Anomaly.objects.bulk_create(anomalies, batch_size=BATCH_SIZE, ignore_conflicts=True)
+        AnomalyScan.objects.create(last_reading_id=int(ids.max()), flagged=len(anomalies))
+    return len(anomalies)
@@ -0,0 +1,123 @@
+from collections import defaultdict
+from decimal import Decimal
+from itertools import groupby
+from operator import itemgetter
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Meter, MeterReading
+from .readings import repair_chain
+
+TRAILING_READINGS = 3
+CENT = Decimal('0.01')
+
+
+def forecast(history, month):
+    """Expected consumption for a calendar month from (date, consumption) history.
+
+    The average of the same month in earlier years is used when there is
+    one, otherwise the mean of the last few readings.
+    """
+    seasonal = [units for reading_date, units in history if reading_date.month == month]
+    sample = seasonal or [units for _, units in history[-TRAILING_READINGS:]]
+    return (sum(sample) / len(sample)).quantize(CENT)
+
+
+def estimate_readings(period, read_by):
+    """Create estimated readings for every current meter not read in period.
+
+    Unread meters and the actual readings they can be forecast from are each
+    loaded in one query over the whole estate and the estimates are inserted
+    in bulk, dated the last day of the period. Only periods that have ended
+    can be estimated, so a meter still due to be read is never given a
+    forecast. Meters already read later than the period or without any
+    history are left alone, so reruns only fill gaps that are still open.
+    Returns the number of estimated readings.
+    """
+    if period.end_date >= timezone.localdate():
+        raise ValidationError(f'Period {period} has not ended yet')
+    reading_date = period.end_date
+    meters = {
+        meter.pk: meter
+        for meter in Meter.objects.filter(
+            is_current=True,
+            last_reading_date__lt=period.start_date,
+        ).only('id', 'last_reading_value')
+    }
+    if not meters:
+        return 0
+
+    history = defaultdict(list)
+    rows = MeterReading.objects.filter(
+        meter__is_current=True,
+        meter__last_reading_date__lt=period.start_date,
+        is_estimated=False,
+    ).order_by('meter_id', 'reading_date', 'id').values_list('meter_id', 'reading_date', 'consumption')
+    for meter_id, date, units in rows.iterator(chunk_size=5000):
+        history[meter_id].append((date, units))
+
+    estimates = []
+    for meter_id, meter in meters.items():
+        if not history[meter_id]:
+            continue
+        units = forecast(history[meter_id], period.start_date.month)
+        if units <= 0:
+            continue
+        estimates.append(MeterReading(
+            meter_id=meter_id,
+            previous_reading=meter.last_reading_value,
+            current_reading=meter.last_reading_value + units,
+            consumption=units,
+            reading_date=reading_date,
+            read_by=read_by,
+            is_estimated=True,
+        ))
+
+    with transaction.atomic():
+        MeterReading.objects.bulk_create(estimates, batch_size=1000)
+        Meter.objects.filter(pk__in=[reading.meter_id for reading in estimates]).rebuild_last_readings()
+    return len(estimates)
+
+
+def reconcile_estimates(meter_ids):
+    """Settle estimated readings against the actual readings around them.
+
+    Every run of estimates between two actual readings is moved onto the
+    straight line joining them by date, so the actual consumption is spread
+    over the estimated months and the chain stays increasing. Estimates not
+    yet followed by an actual reading are kept. Returns the number of
+    readings changed.
+    """
+    rows = MeterReading.objects.filter(meter_id__in=meter_ids).order_by(
+        'meter_id', 'reading_date', 'id'
+    ).values_list('meter_id', 'id', 'reading_date', 'current_reading', 'is_estimated')
+
+    changed = []
+    repair_from = {}
+    for meter_id, readings in groupby(rows, itemgetter(0)):
+        start = None
+        pending = []
+        for _, reading_id, reading_date, current_reading, is_estimated in readings:
+            if is_estimated:
+                pending.append((reading_id, reading_date, current_reading))
+                continue
+            if start and pending:
+                start_date, start_value = start
+                days = (reading_date - start_date).days or 1
+                for estimate_id, estimate_date, estimate_value in pending:
+                    value = (
+                        start_value + (current_reading - start_value) * (estimate_date - start_date).days / days
+                    ).quantize(CENT)
+                    if value != estimate_value:
+                        changed.append(MeterReading(pk=estimate_id, current_reading=value))
+                        repair_from.setdefault(meter_id, estimate_date)
+            start = (reading_date, current_reading)
+            pending = []
+
+    with transaction.atomic():
+        MeterReading.objects.bulk_update(changed, ['current_reading'], batch_size=1000)
+        for meter_id, from_date in repair_from.items():
+            repair_chain(meter_id, from_date)
+    return len(changed)
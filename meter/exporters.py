@@ -0,0 +1,24 @@
+from ems.exports import CHUNK_SIZE
+
+from .models import MeterReading
+
+READING_EXPORT_HEADER = [
+    'hse_number', 'meter_number', 'reading_date', 'previous_reading',
+    'current_reading', 'consumption', 'is_estimated', 'read_by',
+]
+
+
+def reading_rows(start_date, end_date, chunk_size=CHUNK_SIZE):
+    """Readings taken between two dates with their house, meter and reader, in one streamed query"""
+    return MeterReading.objects.filter(
+        reading_date__range=(start_date, end_date),
+    ).order_by('meter_id', 'reading_date', 'id').values_list(
+        'meter__house__hse_number',
+        'meter__meter_number',
+        'reading_date',
+        'previous_reading',
+        'current_reading',
+        'consumption',
+        'is_estimated',
+        'read_by__username',
+    ).iterator(chunk_size=chunk_size)
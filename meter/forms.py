@@ -1,6 +1,7 @@
 from django import forms
 from django.core.exceptions import ValidationError
 from .models import Meter, MeterReading
+from .importers import FORMATS
 
 class MeterForm(forms.ModelForm):
     class Meta:
@@ -35,8 +36,7 @@ class MeterReadingForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         self.meter = meter
         if self.meter:
-            last_reading = self.meter.readings.order_by('-reading_date', '-id').first()
-            self.last_reading_value = last_reading.current_reading if last_reading else 0
+            self.last_reading_value = self.meter.last_actual_value
             self.fields['previous_reading'] = forms.DecimalField(
                 initial=self.last_reading_value,
                 disabled=True,
@@ -48,12 +48,18 @@ class MeterReadingForm(forms.ModelForm):
         current_reading = cleaned_data.get('current_reading')
         
         if current_reading and self.meter:
-            last_reading = self.meter.readings.order_by('-reading_date', '-id').first()
-            last_reading_value = last_reading.current_reading if last_reading else 0
+            last_reading_value = self.meter.last_actual_value
             
             if current_reading <= last_reading_value:
                 raise ValidationError({
                     'current_reading': f'Current reading must be greater than the previous reading ({last_reading_value})'
                 })
         
-        return cleaned_data
\ No newline at end of file
+        return cleaned_data
+
+class ReadingImportForm(forms.Form):
+    file = forms.FileField()
+    format = forms.ChoiceField(
+        choices=[(fmt, fmt.upper()) for fmt in FORMATS],
+        required=False
+    )
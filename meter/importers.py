@@ -0,0 +1,220 @@
+import json
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from ems.imports import checked, read_csv_rows
+
+from .estimates import reconcile_estimates
+from .models import Meter, MeterReading
+
+CHUNK_SIZE = 2000
+FORMATS = ('csv', 'jsonl')
+
+
+def detect_format(filename):
+    """Guess the import format from a file name, defaulting to CSV"""
+    if filename.lower().endswith(('.jsonl', '.ndjson', '.json')):
+        return 'jsonl'
+    return 'csv'
+
+
+def read_rows(stream, fmt):
+    """Yield (line_number, row) pairs from a text stream.
+
+    Rows that cannot be parsed are yielded as None so the importer can
+    report them against the right line. A file that cannot be decoded
+    raises UnreadableFile.
+    """
+    if fmt == 'csv':
+        yield from read_csv_rows(stream)
+        return
+
+    for line_number, line in checked(enumerate(stream, start=1)):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_number, row if isinstance(row, dict) else None
+
+
+class DuplicateReading(Exception):
+    """Row carries an idempotency key that was already recorded"""
+
+    def __init__(self, reading):
+        self.reading = reading
+
+
+class ReadingImporter:
+    """Validate meter readings keyed by meter_number and bulk insert them.
+
+    Rows are consumed in chunks. Each chunk resolves its unseen meters in a
+    single query, reading the previous value from the denormalized last
+    reading fields, and the running last value per meter is kept in memory
+    so readings for the same meter later in the file chain onto each other.
+    Rows carrying an ``idempotency_key`` that is already recorded for the
+    meter are skipped as duplicates. Invalid rows are collected in
+    ``errors`` and do not abort the rest of the batch.
+    """
+
+    def __init__(self, read_by, chunk_size=CHUNK_SIZE):
+        self.read_by = read_by
+        self.chunk_size = chunk_size
+        self.created = 0
+        self.duplicates = 0
+        self.errors = []
+        self._outcomes = []
+        self._meters = {}
+        self._keys = {}
+        self._estimated = set()
+        self._reading_field = MeterReading._meta.get_field('current_reading')
+
+    @property
+    def results(self):
+        """Outcome of every row in input order, once the import has run"""
+        results = []
+        for line_number, status, reading, error in self._outcomes:
+            result = {'line': line_number, 'status': status}
+            if reading is not None:
+                result['id'] = reading if isinstance(reading, int) else reading.pk
+            if error:
+                result['error'] = error
+            results.append(result)
+        return results
+
+    def run(self, rows):
+        rows = iter(rows)
+        with transaction.atomic():
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if not chunk:
+                    break
+                self._import_chunk(chunk)
+        return self
+
+    def _load_meters(self, meter_numbers):
+        missing = meter_numbers - self._meters.keys()
+        if not missing:
+            return
+        # Lock the meters so concurrent readings cannot change their last
+        # value while this import is chaining onto it
+        for meter in Meter.objects.select_for_update().filter(meter_number__in=missing):
+            self._meters[meter.meter_number] = meter
+
+    def _load_keys(self, chunk):
+        keys = {
+            str(row.get('idempotency_key') or '').strip()
+            for _, row in chunk if row
+        } - {''}
+        if not keys:
+            return
+        recorded = MeterReading.objects.filter(
+            idempotency_key__in=keys,
+            meter__in=[meter.pk for meter in self._meters.values()]
+        ).values_list('meter_id', 'idempotency_key', 'id')
+        for meter_id, key, reading_id in recorded:
+            self._keys.setdefault((meter_id, key), reading_id)
+
+    def _import_chunk(self, chunk):
+        self._load_meters({
+            str(row.get('meter_number') or '').strip()
+            for _, row in chunk if row
+        })
+        self._load_keys(chunk)
+
+        readings = []
+        for line_number, row in chunk:
+            try:
+                reading = self._build_reading(row)
+            except DuplicateReading as e:
+                self.duplicates += 1
+                self._outcomes.append((line_number, 'duplicate', e.reading, None))
+            except ValidationError as e:
+                error = ' '.join(e.messages)
+                self.errors.append({
+                    'line': line_number,
+                    'meter_number': row.get('meter_number', '') if row else '',
+                    'error': error,
+                })
+                self._outcomes.append((line_number, 'rejected', None, error))
+            else:
+                readings.append(reading)
+                self._outcomes.append((line_number, 'created', reading, None))
+
+        MeterReading.objects.bulk_create(readings, batch_size=self.chunk_size)
+        if self._estimated:
+            # Spread the actual consumption over the estimates it follows
+            reconcile_estimates(self._estimated)
+            self._estimated.clear()
+        Meter.objects.filter(
+            pk__in={reading.meter_id for reading in readings}
+        ).rebuild_last_readings()
+        self.created += len(readings)
+
+    def _build_reading(self, row):
+        if row is None:
+            raise ValidationError('Row could not be parsed')
+
+        meter_number = str(row.get('meter_number') or '').strip()
+        if not meter_number:
+            raise ValidationError('Missing meter_number')
+        meter = self._meters.get(meter_number)
+        if meter is None:
+            raise ValidationError(f'Unknown meter {meter_number}')
+
+        idempotency_key = str(row.get('idempotency_key') or '').strip() or None
+        if idempotency_key and (meter.pk, idempotency_key) in self._keys:
+            raise DuplicateReading(self._keys[(meter.pk, idempotency_key)])
+
+        if not meter.is_current:
+            raise ValidationError(f'Meter {meter_number} is not the current meter')
+
+        current_reading = self._reading_field.clean(row.get('current_reading'), None)
+
+        today = timezone.now().date()
+        raw_date = row.get('reading_date')
+        if raw_date:
+            try:
+                reading_date = parse_date(str(raw_date).strip())
+            except ValueError:
+                reading_date = None
+            if reading_date is None:
+                raise ValidationError(f'Invalid reading_date {raw_date}')
+        else:
+            reading_date = today
+        if reading_date > today:
+            raise ValidationError('Reading date cannot be in the future')
+
+        previous_reading = meter.last_reading_value
+        if meter.last_reading_date and reading_date < meter.last_reading_date:
+            raise ValidationError(
+                f'Reading date is earlier than the last reading ({meter.last_reading_date})'
+            )
+        if current_reading <= meter.last_actual_value:
+            raise ValidationError(
+                f'Current reading must be greater than the previous reading ({meter.last_actual_value})'
+            )
+        if meter.has_pending_estimate:
+            self._estimated.add(meter.pk)
+
+        # Track the running last reading so later rows for this meter chain on
+        meter.last_reading_value = meter.last_actual_value = current_reading
+        meter.last_reading_date = reading_date
+        reading = MeterReading(
+            meter=meter,
+            current_reading=current_reading,
+            previous_reading=previous_reading,
+            consumption=current_reading - previous_reading,
+            reading_date=reading_date,
+            read_by=self.read_by,
+            idempotency_key=idempotency_key,
+        )
+        if idempotency_key:
+            self._keys[(meter.pk, idempotency_key)] = reading
+        return reading
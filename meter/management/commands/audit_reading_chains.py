@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from meter.models import Meter
+from meter.readings import chain_breaks, repair_chain
+
+
+class Command(BaseCommand):
+    help = 'Report meter readings whose previous reading or consumption break the chain'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repair', action='store_true', help='Recompute the broken readings')
+        parser.add_argument('--limit', type=int, default=50, help='Number of breaks to list')
+
+    def handle(self, *args, **options):
+        breaks = chain_breaks().values_list(
+            'id', 'meter__meter_number', 'reading_date', 'previous_reading', 'expected_previous'
+        )
+        count = 0
+        for reading_id, meter_number, reading_date, previous, expected in breaks.iterator():
+            if count < options['limit']:
+                self.stdout.write(
+                    f'Meter {meter_number} reading {reading_id} on {reading_date}: '
+                    f'previous {previous}, expected {expected:.2f}'
+                )
+            count += 1
+
+        if not count:
+            self.stdout.write(self.style.SUCCESS('All reading chains are consistent.'))
+            return
+        self.stdout.write(self.style.WARNING(f'{count} broken readings found.'))
+
+        if options['repair']:
+            with transaction.atomic():
+                repaired = repair_chain()
+                Meter.objects.all().rebuild_last_readings()
+            self.stdout.write(self.style.SUCCESS(f'Repaired {repaired} readings.'))
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from meter.anomalies import MIN_HISTORY, Z_THRESHOLD, ZERO_STREAK, detect_anomalies
+
+
+class Command(BaseCommand):
+    help = 'Flag anomalous meter readings across the whole estate'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Rescan every reading, not only new ones')
+        parser.add_argument('--z-threshold', type=float, default=Z_THRESHOLD)
+        parser.add_argument('--min-history', type=int, default=MIN_HISTORY)
+        parser.add_argument('--zero-streak', type=int, default=ZERO_STREAK)
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        flagged = detect_anomalies(
+            full=options['full'],
+            z_threshold=options['z_threshold'],
+            min_history=options['min_history'],
+            zero_streak=options['zero_streak'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Flagged {flagged} readings in {time.monotonic() - started:.1f}s.'
+        ))
@@ -0,0 +1,31 @@
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from billing.engine import get_period, period_bounds
+from meter.estimates import estimate_readings
+
+
+class Command(BaseCommand):
+    help = 'Estimate the readings of current meters that were not read in a period'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--period', required=True, help='Reading period as YYYY-MM')
+        parser.add_argument('--user', required=True, help='Username recorded as the reader')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']} does not exist")
+        try:
+            start_date, end_date = period_bounds(options['period'])
+        except ValidationError as e:
+            raise CommandError(' '.join(e.messages))
+        if end_date >= timezone.localdate():
+            raise CommandError(f'Period {start_date:%Y-%m} has not ended yet, readings can only be estimated for past months')
+        period = get_period(options['period'])
+
+        estimated = estimate_readings(period, user)
+        self.stdout.write(self.style.SUCCESS(f'Estimated {estimated} readings for {period}.'))
@@ -0,0 +1,32 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from billing.engine import period_bounds
+from ems.exports import CHUNK_SIZE, write_csv
+from meter.exporters import READING_EXPORT_HEADER, reading_rows
+
+
+class Command(BaseCommand):
+    help = 'Export the meter readings of a period as CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file to write')
+        parser.add_argument('--period', required=True, help='Reading period as YYYY-MM')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Rows fetched per database round trip')
+
+    def handle(self, *args, **options):
+        try:
+            start_date, end_date = period_bounds(options['period'])
+        except ValidationError as e:
+            raise CommandError(' '.join(e.messages))
+
+        rows = reading_rows(start_date, end_date, options['chunk_size'])
+        try:
+            with open(options['path'], 'w', encoding='utf-8', newline='') as stream:
+                written = write_csv(stream, READING_EXPORT_HEADER, rows)
+        except OSError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {written} readings for {start_date:%Y-%m} to {options['path']}."
+        ))
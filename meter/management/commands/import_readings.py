@@ -0,0 +1,36 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from ems.imports import UnreadableFile
+from meter.importers import CHUNK_SIZE, FORMATS, ReadingImporter, detect_format, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Bulk import meter readings from a CSV or JSONL file keyed by meter_number'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSONL file with meter_number, current_reading and optional reading_date')
+        parser.add_argument('--user', required=True, help='Username recorded as the reader')
+        parser.add_argument('--format', choices=FORMATS, help='File format (guessed from the extension by default)')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']} does not exist")
+
+        fmt = options['format'] or detect_format(options['path'])
+        try:
+            with open(options['path'], encoding='utf-8-sig', newline='') as stream:
+                importer = ReadingImporter(user, chunk_size=options['chunk_size'])
+                importer.run(read_rows(stream, fmt))
+        except (OSError, UnreadableFile) as e:
+            raise CommandError(str(e))
+
+        for error in importer.errors:
+            self.stderr.write(f"Line {error['line']} ({error['meter_number']}): {error['error']}")
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {importer.created} readings, {importer.duplicates} duplicates skipped, '
+            f'{len(importer.errors)} rows rejected.'
+        ))
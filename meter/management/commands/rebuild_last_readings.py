@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from meter.models import Meter
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalized last reading fields on every meter from its readings'
+
+    def handle(self, *args, **options):
+        updated = Meter.objects.all().rebuild_last_readings()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt last readings for {updated} meters.'))
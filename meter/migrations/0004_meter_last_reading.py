@@ -0,0 +1,53 @@
+# Generated by Django 4.2.16 on 2026-10-18 01:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_last_readings(apps, schema_editor):
+    Meter = apps.get_model('meter', 'Meter')
+    MeterReading = apps.get_model('meter', 'MeterReading')
+    latest = MeterReading.objects.filter(
+        meter=OuterRef('pk')
+    ).order_by('-reading_date', '-id')
+    Meter.objects.update(
+        last_reading=Subquery(latest.values('id')[:1]),
+        last_reading_value=Coalesce(
+            Subquery(latest.values('current_reading')[:1]),
+            Value(0),
+            output_field=models.DecimalField(max_digits=10, decimal_places=2)
+        ),
+        last_reading_date=Subquery(latest.values('reading_date')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meter', '0003_alter_meterreading_rate_per_unit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meter',
+            name='last_reading',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='meter.meterreading'),
+        ),
+        migrations.AddField(
+            model_name='meter',
+            name='last_reading_date',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='meter',
+            name='last_reading_value',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=10),
+        ),
+        migrations.AddIndex(
+            model_name='meterreading',
+            index=models.Index(fields=['meter', '-reading_date', '-id'], name='meter_reading_latest_idx'),
+        ),
+        migrations.RunPython(populate_last_readings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.16 on 2026-10-18 01:59
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0002_tariff'),
+        ('meter', '0004_meter_last_reading'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='meterreading',
+            name='rate_per_unit',
+        ),
+    ]
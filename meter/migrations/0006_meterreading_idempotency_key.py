@@ -0,0 +1,22 @@
+# Generated by Django 4.2.16 on 2026-10-18 02:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meter', '0005_remove_meterreading_rate_per_unit'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meterreading',
+            name='idempotency_key',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='meterreading',
+            constraint=models.UniqueConstraint(fields=('meter', 'idempotency_key'), name='unique_reading_idempotency_key'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.16 on 2026-10-18 02:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meter', '0006_meterreading_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnomalyScan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_reading_id', models.BigIntegerField()),
+                ('flagged', models.PositiveIntegerField(default=0)),
+                ('scanned_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-scanned_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Anomaly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('self_zscore', 'Unusual for the house'), ('peer_zscore', 'Unusual for the unit type'), ('zero_streak', 'Zero consumption streak'), ('negative', 'Negative consumption')], max_length=20)),
+                ('score', models.FloatField()),
+                ('detected_at', models.DateTimeField(auto_now_add=True)),
+                ('reading', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='anomalies', to='meter.meterreading')),
+            ],
+            options={
+                'verbose_name_plural': 'Anomalies',
+                'ordering': ['-detected_at'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='anomaly',
+            constraint=models.UniqueConstraint(fields=('reading', 'kind'), name='unique_anomaly_per_reading_kind'),
+        ),
+    ]
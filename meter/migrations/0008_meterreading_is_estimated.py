@@ -0,0 +1,30 @@
+# Generated by Django 4.2.16 on 2026-10-18 02:09
+
+from django.db import migrations, models
+
+
+def populate_last_actual_value(apps, schema_editor):
+    # Every existing reading is an actual one
+    Meter = apps.get_model('meter', 'Meter')
+    Meter.objects.update(last_actual_value=models.F('last_reading_value'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meter', '0007_anomaly'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meter',
+            name='last_actual_value',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=10),
+        ),
+        migrations.AddField(
+            model_name='meterreading',
+            name='is_estimated',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(populate_last_actual_value, migrations.RunPython.noop),
+    ]
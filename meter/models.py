@@ -1,6 +1,30 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
 from house.models import House 
+from billing.tariffs import price
+
+class MeterQuerySet(models.QuerySet):
+    def rebuild_last_readings(self):
+        """Recompute the denormalized last reading fields in a single UPDATE"""
+        latest = MeterReading.objects.filter(
+            meter=OuterRef('pk')
+        ).order_by('-reading_date', '-id')
+        return self.update(
+            last_reading=Subquery(latest.values('id')[:1]),
+            last_reading_value=Coalesce(
+                Subquery(latest.values('current_reading')[:1]),
+                Value(0),
+                output_field=models.DecimalField(max_digits=10, decimal_places=2)
+            ),
+            last_reading_date=Subquery(latest.values('reading_date')[:1]),
+            last_actual_value=Coalesce(
+                Subquery(latest.filter(is_estimated=False).values('current_reading')[:1]),
+                Value(0),
+                output_field=models.DecimalField(max_digits=10, decimal_places=2)
+            ),
+        )
 
 class Meter(models.Model):
     STATUS_CHOICES = [
@@ -17,7 +41,23 @@ class Meter(models.Model):
     is_current = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+    # Denormalized copy of the latest reading, maintained by MeterReading.save
+    # and the post_delete signal so the reading form never has to look it up
+    last_reading = models.ForeignKey(
+        'MeterReading',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+'
+    )
+    last_reading_value = models.DecimalField(max_digits=10, decimal_places=2, default=0, editable=False)
+    last_reading_date = models.DateField(null=True, blank=True, editable=False)
+    # Latest value actually read off the meter; new readings are checked
+    # against it so they can come in below a pending estimate
+    last_actual_value = models.DecimalField(max_digits=10, decimal_places=2, default=0, editable=False)
+
+    objects = MeterQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.meter_number} - {self.house}"
@@ -27,6 +67,30 @@ class Meter(models.Model):
         self.is_current = False
         self.save()
 
+    @property
+    def has_pending_estimate(self):
+        """Whether estimated readings follow the last actual reading"""
+        return self.last_reading_value > self.last_actual_value
+
+    def set_last_reading(self, reading):
+        """Point the denormalized last reading fields at a newer reading and persist them"""
+        self.last_reading = reading
+        self.last_reading_value = reading.current_reading
+        self.last_reading_date = reading.reading_date
+        if not reading.is_estimated:
+            self.last_actual_value = reading.current_reading
+        Meter.objects.filter(pk=self.pk).update(
+            last_reading=reading,
+            last_reading_value=self.last_reading_value,
+            last_reading_date=self.last_reading_date,
+            last_actual_value=self.last_actual_value,
+        )
+
+    def refresh_last_reading(self):
+        """Recompute the last reading fields from the readings table"""
+        Meter.objects.filter(pk=self.pk).rebuild_last_readings()
+        self.refresh_from_db(fields=['last_reading', 'last_reading_value', 'last_reading_date', 'last_actual_value'])
+
 class MeterReading(models.Model):
     meter = models.ForeignKey(Meter, on_delete=models.PROTECT, related_name='readings')
     current_reading = models.DecimalField(max_digits=10, decimal_places=2)
@@ -35,19 +99,92 @@ class MeterReading(models.Model):
     read_by = models.ForeignKey(User, on_delete=models.PROTECT)
     consumption = models.DecimalField(max_digits=10, decimal_places=2, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    rate_per_unit = models.DecimalField(max_digits=6, decimal_places=2, default=171)
+    # Client supplied key that makes retried submissions return the original row
+    idempotency_key = models.CharField(max_length=64, null=True, blank=True, editable=False)
+    # Forecast for a month the meter could not be read, see meter.estimates
+    is_estimated = models.BooleanField(default=False, editable=False)
 
     @property
     def bill_amount(self):
-       return round(self.consumption * self.rate_per_unit, 2)
+       return price(self.meter.house.unit_type, self.reading_date, self.consumption)
 
     def save(self, *args, **kwargs):
-        if not self.pk:  # Only for new readings
-            last_reading = self.meter.readings.order_by('-reading_date', '-id').first()
-            self.previous_reading = last_reading.current_reading if last_reading else 0
-        
-        self.consumption = self.current_reading - self.previous_reading
-        super().save(*args, **kwargs)
+        from .estimates import reconcile_estimates
+        from .readings import repair_chain
+
+        meter = self.meter
+        # The first actual reading after estimates settles their values
+        reconcile = not self.pk and not self.is_estimated and meter.has_pending_estimate
+        with transaction.atomic():
+            if self.pk:
+                # An edited reading shifts the chain from its earliest date on
+                old_date = MeterReading.objects.filter(pk=self.pk).values_list('reading_date', flat=True).first()
+                chain_from = min(filter(None, [old_date, self.reading_date]))
+            elif meter.last_reading_date and self.reading_date < meter.last_reading_date:
+                chain_from = self.reading_date  # Back-dated correction
+            else:
+                chain_from = None
+
+            if chain_from is None:
+                self.previous_reading = meter.last_reading_value
+            elif self.previous_reading is None:
+                self.previous_reading = 0  # Set by the chain repair below
+            self.consumption = self.current_reading - self.previous_reading
+            super().save(*args, **kwargs)
+
+            if chain_from is not None and repair_chain(meter.pk, chain_from):
+                self.refresh_from_db(fields=['previous_reading', 'consumption'])
+            if reconcile and reconcile_estimates([meter.pk]):
+                self.refresh_from_db(fields=['previous_reading', 'consumption'])
+
+            if meter.last_reading_id is None or (
+                (self.reading_date, self.pk) >= (meter.last_reading_date, meter.last_reading_id)
+            ):
+                meter.set_last_reading(self)
+            elif meter.last_reading_id == self.pk:
+                # The latest reading was moved back in time
+                meter.refresh_last_reading()
+
+    class Meta:
+        ordering = ['-reading_date', '-id']
+        indexes = [
+            models.Index(fields=['meter', '-reading_date', '-id'], name='meter_reading_latest_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['meter', 'idempotency_key'], name='unique_reading_idempotency_key'),
+        ]
+
+
+class Anomaly(models.Model):
+    """Reading flagged by the detect_anomalies job"""
+    KIND_CHOICES = [
+        ('self_zscore', 'Unusual for the house'),
+        ('peer_zscore', 'Unusual for the unit type'),
+        ('zero_streak', 'Zero consumption streak'),
+        ('negative', 'Negative consumption'),
+    ]
+
+    reading = models.ForeignKey(MeterReading, on_delete=models.CASCADE, related_name='anomalies')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    score = models.FloatField()
+    detected_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.get_kind_display()} - reading {self.reading_id}"
+
+    class Meta:
+        ordering = ['-detected_at']
+        verbose_name_plural = 'Anomalies'
+        constraints = [
+            models.UniqueConstraint(fields=['reading', 'kind'], name='unique_anomaly_per_reading_kind'),
+        ]
+
+
+class AnomalyScan(models.Model):
+    """High-water mark of the readings already scanned for anomalies"""
+    last_reading_id = models.BigIntegerField()
+    flagged = models.PositiveIntegerField(default=0)
+    scanned_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        ordering = ['-reading_date', '-id']
\ No newline at end of file
+        ordering = ['-scanned_at']
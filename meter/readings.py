@@ -0,0 +1,120 @@
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, transaction
+from django.db.models import DecimalField, F, Q, Value, Window
+from django.db.models.functions import Coalesce, Lag, Round
+from django.utils import timezone
+
+from .models import Meter, MeterReading
+
+
+def record_reading(meter_id, current_reading, read_by, reading_date=None, idempotency_key=None):
+    """Create a meter reading while holding a lock on the meter row.
+
+    The previous reading is taken from the locked meter, so concurrent
+    readers of the same meter are chained one after the other instead of
+    both starting from the same value. When an idempotency key is given and
+    a reading with that key already exists for the meter, that reading is
+    returned instead of inserting a duplicate. Returns (reading, created).
+    """
+    reading_date = reading_date or timezone.now().date()
+    try:
+        with transaction.atomic():
+            meter = Meter.objects.select_for_update().get(pk=meter_id)
+            if idempotency_key:
+                existing = meter.readings.filter(idempotency_key=idempotency_key).first()
+                if existing:
+                    return existing, False
+
+            if current_reading <= meter.last_actual_value:
+                raise ValidationError(
+                    f'Current reading must be greater than the previous reading ({meter.last_actual_value})'
+                )
+
+            reading = MeterReading(
+                meter=meter,
+                current_reading=current_reading,
+                reading_date=reading_date,
+                read_by=read_by,
+                idempotency_key=idempotency_key or None,
+            )
+            reading.save()
+            return reading, True
+    except IntegrityError:
+        # Backends without row locks can still race on the key; the unique
+        # constraint keeps one row and the retry gets it back
+        if not idempotency_key:
+            raise
+        return MeterReading.objects.get(meter_id=meter_id, idempotency_key=idempotency_key), False
+
+
+def expected_previous():
+    """Previous reading each row should carry: the meter's reading just before it"""
+    return Coalesce(
+        Window(
+            Lag('current_reading'),
+            partition_by=[F('meter_id')],
+            order_by=[F('reading_date').asc(), F('id').asc()],
+        ),
+        Value(0),
+        output_field=DecimalField(max_digits=10, decimal_places=2)
+    )
+
+
+def chain_breaks(meters=None):
+    """Readings whose previous reading or consumption disagree with the chain.
+
+    All meters (or the given queryset of meters) are checked in a single
+    pass over the readings table.
+    """
+    readings = MeterReading.objects.all()
+    if meters is not None:
+        readings = readings.filter(meter__in=meters)
+    return readings.annotate(
+        expected_previous=expected_previous()
+    ).filter(
+        ~Q(previous_reading=F('expected_previous'))
+        | ~Q(consumption=Round(F('current_reading') - F('expected_previous'), 2))
+    ).order_by('meter_id', 'reading_date', 'id')
+
+
+def repair_chain(meter_id=None, from_date=None):
+    """Recompute previous_reading and consumption with a single UPDATE.
+
+    LAG over each meter's readings ordered by date gives the value every row
+    should follow on from. Only rows of meter_id (all meters when omitted)
+    dated from_date onwards that actually disagree are written. Returns the
+    number of repaired readings.
+    """
+    table = connection.ops.quote_name(MeterReading._meta.db_table)
+    scope = []
+    params = []
+    if meter_id is not None:
+        scope.append('meter_id = %s')
+        params.append(meter_id)
+    inner_where = f"WHERE {' AND '.join(scope)}" if scope else ''
+
+    outer = ['reading.id = chain.id']
+    if from_date is not None:
+        outer.append('reading.reading_date >= %s')
+        params.append(from_date)
+    outer.append(
+        '(reading.previous_reading <> chain.expected'
+        ' OR reading.consumption <> ROUND(reading.current_reading - chain.expected, 2))'
+    )
+
+    sql = f"""
+        UPDATE {table} AS reading
+        SET previous_reading = chain.expected,
+            consumption = ROUND(reading.current_reading - chain.expected, 2)
+        FROM (
+            SELECT id, COALESCE(
+                LAG(current_reading) OVER (PARTITION BY meter_id ORDER BY reading_date, id), 0
+            ) AS expected
+            FROM {table}
+            {inner_where}
+        ) AS chain
+        WHERE {' AND '.join(outer)}
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
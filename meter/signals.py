@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Meter, MeterReading
+from .readings import repair_chain
+
+
+@receiver(post_delete, sender=MeterReading)
+def refresh_meter_last_reading(sender, instance, **kwargs):
+    repair_chain(instance.meter_id, instance.reading_date)
+    Meter.objects.filter(pk=instance.meter_id).rebuild_last_readings()
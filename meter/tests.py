@@ -1,3 +1,361 @@
-from django.test import TestCase
+import threading
+from datetime import date
+from decimal import Decimal
 
-# Create your tests here.
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.urls import reverse
+from django.utils import timezone
+
+from billing.engine import get_period
+from billing.models import Tariff
+from billing.tariffs import resolver
+from house.models import House
+from .anomalies import detect_anomalies, find_anomalies
+from .estimates import estimate_readings
+from .models import Anomaly, AnomalyScan, Meter, MeterReading
+from .readings import chain_breaks, record_reading
+
+
+def run_in_threads(target, args_list):
+    """Start one thread per args tuple behind a barrier and wait for all"""
+    barrier = threading.Barrier(len(args_list))
+    errors = []
+
+    def worker(*args):
+        try:
+            barrier.wait()
+            target(*args)
+        except Exception as e:  # noqa: BLE001
+            errors.append(e)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker, args=args) for args in args_list]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class ConcurrentReadingTests(TransactionTestCase):
+    threads = 16
+
+    def setUp(self):
+        self.user = User.objects.create(username='reader')
+        house = House.objects.create(hse_number='A1', unit_type='2BR')
+        self.meter = Meter.objects.create(
+            meter_number='M-A1', house=house, installation_date=date(2024, 1, 1)
+        )
+
+    def test_parallel_readings_keep_the_chain_consistent(self):
+        def submit(value):
+            try:
+                record_reading(self.meter.pk, Decimal(value), self.user)
+            except ValidationError:
+                pass  # Lower than a reading that won the lock first
+
+        errors = run_in_threads(submit, [(10 * (i + 1),) for i in range(self.threads)])
+        self.assertEqual(errors, [])
+
+        readings = list(self.meter.readings.order_by('id'))
+        self.assertTrue(readings)
+        previous = Decimal(0)
+        for reading in readings:
+            self.assertEqual(reading.previous_reading, previous)
+            self.assertEqual(reading.consumption, reading.current_reading - previous)
+            self.assertGreater(reading.current_reading, previous)
+            previous = reading.current_reading
+
+        self.meter.refresh_from_db()
+        self.assertEqual(self.meter.last_reading_id, readings[-1].pk)
+        self.assertEqual(self.meter.last_reading_value, previous)
+
+    def test_retries_with_the_same_key_create_one_reading(self):
+        results = []
+
+        def submit():
+            results.append(record_reading(
+                self.meter.pk, Decimal(25), self.user, idempotency_key='retry-1'
+            ))
+
+        errors = run_in_threads(submit, [() for _ in range(self.threads)])
+        self.assertEqual(errors, [])
+
+        self.assertEqual(self.meter.readings.count(), 1)
+        self.assertEqual(sum(created for _, created in results), 1)
+        self.assertEqual({reading.pk for reading, _ in results}, {self.meter.readings.get().pk})
+
+
+class ReadingChainTests(TestCase):
+    """Idempotency and chain repair, which do not depend on row locks"""
+
+    def setUp(self):
+        self.user = User.objects.create(username='reader')
+        house = House.objects.create(hse_number='A1', unit_type='2BR')
+        self.meter = Meter.objects.create(
+            meter_number='M-A1', house=house, installation_date=date(2024, 1, 1)
+        )
+
+    def add(self, value, reading_date):
+        reading = MeterReading(
+            meter=self.meter, current_reading=Decimal(value), reading_date=reading_date, read_by=self.user
+        )
+        reading.save()
+        return reading
+
+    def assertChain(self, expected):
+        """Readings in date order carry (previous_reading, current_reading, consumption) as expected"""
+        readings = self.meter.readings.order_by('reading_date', 'id')
+        self.assertEqual(
+            [(r.previous_reading, r.current_reading, r.consumption) for r in readings],
+            [tuple(Decimal(value) for value in row) for row in expected]
+        )
+        self.assertFalse(chain_breaks(Meter.objects.filter(pk=self.meter.pk)).exists())
+        self.meter.refresh_from_db()
+        latest = readings.last()
+        self.assertEqual(self.meter.last_reading_id, latest.pk)
+        self.assertEqual(self.meter.last_reading_value, latest.current_reading)
+
+    def test_retry_with_the_same_key_returns_the_original_reading(self):
+        first, created = record_reading(self.meter.pk, Decimal(10), self.user, idempotency_key='round-1')
+        again, created_again = record_reading(self.meter.pk, Decimal(10), self.user, idempotency_key='round-1')
+
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.assertEqual(again.pk, first.pk)
+        self.assertEqual(self.meter.readings.count(), 1)
+
+        _, created = record_reading(self.meter.pk, Decimal(20), self.user, idempotency_key='round-2')
+        self.assertTrue(created)
+        self.assertChain([(0, 10, 10), (10, 20, 10)])
+
+    def test_reading_lower_than_the_previous_is_rejected(self):
+        record_reading(self.meter.pk, Decimal(10), self.user)
+        with self.assertRaises(ValidationError):
+            record_reading(self.meter.pk, Decimal(5), self.user)
+        self.assertEqual(self.meter.readings.count(), 1)
+
+    def test_back_dated_reading_is_chained_between_its_neighbours(self):
+        self.add(10, date(2024, 1, 1))
+        self.add(30, date(2024, 3, 1))
+        self.add(20, date(2024, 2, 1))
+
+        self.assertChain([(0, 10, 10), (10, 20, 10), (20, 30, 10)])
+
+    def test_edited_reading_shifts_the_readings_after_it(self):
+        self.add(10, date(2024, 1, 1))
+        february = self.add(20, date(2024, 2, 1))
+        march = self.add(30, date(2024, 3, 1))
+
+        february.current_reading = Decimal(25)
+        february.save()
+        self.assertChain([(0, 10, 10), (10, 25, 15), (25, 30, 5)])
+
+        march.reading_date = date(2024, 1, 15)
+        march.current_reading = Decimal(15)
+        march.save()
+        self.assertChain([(0, 10, 10), (10, 15, 5), (15, 25, 10)])
+
+    def test_deleted_reading_is_bridged_by_the_next_one(self):
+        self.add(10, date(2024, 1, 1))
+        february = self.add(20, date(2024, 2, 1))
+        march = self.add(30, date(2024, 3, 1))
+
+        february.delete()
+        self.assertChain([(0, 10, 10), (10, 30, 20)])
+
+        march.delete()
+        self.assertChain([(0, 10, 10)])
+
+
+def month_label(offset):
+    """YYYY-MM of the month offset months away from the current one"""
+    today = timezone.localdate()
+    year, month = divmod(today.year * 12 + today.month - 1 + offset, 12)
+    return f'{year}-{month + 1:02d}'
+
+
+class EstimateReadingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='reader')
+        house = House.objects.create(hse_number='A1', unit_type='2BR')
+        self.meter = Meter.objects.create(
+            meter_number='M-A1', house=house, installation_date=date(2020, 1, 1)
+        )
+        for offset, value in ((-4, 10), (-3, 20)):
+            MeterReading(
+                meter=self.meter, current_reading=Decimal(value), read_by=self.user,
+                reading_date=get_period(month_label(offset)).start_date,
+            ).save()
+
+    def test_past_unread_period_is_estimated_on_its_last_day(self):
+        period = get_period(month_label(-2))
+        self.assertEqual(estimate_readings(period, self.user), 1)
+
+        estimate = self.meter.readings.get(is_estimated=True)
+        self.assertEqual(estimate.reading_date, period.end_date)
+        self.assertEqual(estimate.previous_reading, Decimal(20))
+        self.assertEqual(estimate.consumption, Decimal(10))
+
+    def test_future_period_is_refused(self):
+        with self.assertRaises(ValidationError):
+            estimate_readings(get_period(month_label(1)), self.user)
+        with self.assertRaises(CommandError):
+            call_command('estimate_readings', period=month_label(2), user='reader')
+        self.assertFalse(self.meter.readings.filter(is_estimated=True).exists())
+
+    def test_period_still_open_is_refused(self):
+        with self.assertRaises(ValidationError):
+            estimate_readings(get_period(month_label(0)), self.user)
+        with self.assertRaises(CommandError):
+            call_command('estimate_readings', period=month_label(0), user='reader')
+        self.assertFalse(self.meter.readings.filter(is_estimated=True).exists())
+
+
+class ReconcileEstimateTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='reader')
+        house = House.objects.create(hse_number='A1', unit_type='2BR')
+        self.meter = Meter.objects.create(
+            meter_number='M-A1', house=house, installation_date=date(2024, 1, 1)
+        )
+        for value, reading_date in ((10, date(2026, 1, 1)), (20, date(2026, 2, 1))):
+            self.add(value, reading_date)
+
+    def add(self, value, reading_date):
+        reading = MeterReading(
+            meter=self.meter, current_reading=Decimal(value), reading_date=reading_date, read_by=self.user
+        )
+        reading.save()
+        return reading
+
+    def test_actual_reading_settles_the_estimates_before_it(self):
+        estimate_readings(get_period('2026-03'), self.user)
+        self.meter.refresh_from_db()
+        self.assertTrue(self.meter.has_pending_estimate)
+
+        actual = self.add(60, date(2026, 4, 30))
+
+        # On the line from 20 on 1 February to 60 on 30 April: 20 + 40 * 58 / 88
+        estimate = self.meter.readings.get(is_estimated=True)
+        self.assertEqual(
+            (estimate.previous_reading, estimate.current_reading, estimate.consumption),
+            (Decimal(20), Decimal('46.36'), Decimal('26.36'))
+        )
+        self.assertEqual((actual.previous_reading, actual.consumption), (Decimal('46.36'), Decimal('13.64')))
+        self.meter.refresh_from_db()
+        self.assertFalse(self.meter.has_pending_estimate)
+        self.assertFalse(chain_breaks(Meter.objects.filter(pk=self.meter.pk)).exists())
+
+
+class ReadingImportViewTests(TestCase):
+    def setUp(self):
+        user = User.objects.create(username='reader')
+        self.client.force_login(user)
+        house = House.objects.create(hse_number='A1', unit_type='2BR')
+        self.meter = Meter.objects.create(
+            meter_number='M-A1', house=house, installation_date=date(2024, 1, 1)
+        )
+
+    def test_file_that_is_not_utf8_is_rejected_with_400(self):
+        upload = SimpleUploadedFile('readings.csv', b'meter_number,current_reading\nM-A1,10\n\xff\xfe\n')
+        response = self.client.post(reverse('reading-import'), {'file': upload})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('file', response.json()['errors'])
+        self.assertFalse(self.meter.readings.exists())
+
+
+class HouseMeterViewTests(TestCase):
+    def setUp(self):
+        user = User.objects.create(username='reader')
+        self.client.force_login(user)
+        self.house = House.objects.create(hse_number='A1', unit_type='2BR')
+        meter = Meter.objects.create(meter_number='M-A1', house=self.house, installation_date=date(2024, 1, 1))
+        MeterReading(meter=meter, current_reading=Decimal(10), reading_date=date(2026, 3, 2), read_by=user).save()
+        Tariff.objects.all().delete()
+        resolver.clear()  # Rolling back an earlier test's tariffs sends no signal to clear it
+
+    def test_reading_without_a_tariff_is_shown_unpriced(self):
+        response = self.client.get(reverse('house-meter', args=[self.house.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'No tariff')
+        self.assertContains(response, 'No 2BR tariff in effect on 2026-03-02')
+
+
+class FindAnomaliesTests(SimpleTestCase):
+    def flagged(self, kind, meter_ids, consumption, unit_codes=None):
+        meter_ids = np.array(meter_ids, dtype=np.int64)
+        unit_codes = np.zeros(len(meter_ids), dtype=np.int64) if unit_codes is None else np.array(unit_codes)
+        mask, _ = find_anomalies(meter_ids, unit_codes, np.array(consumption, dtype=np.float64))[kind]
+        return np.flatnonzero(mask).tolist()
+
+    def test_spike_is_unusual_for_the_house(self):
+        usage = [10, 11, 9, 10, 12, 10, 9, 11, 10, 10, 11, 200]
+        self.assertEqual(self.flagged('self_zscore', [1] * len(usage), usage), [11])
+
+    def test_short_history_is_not_scored(self):
+        usage = [10, 10, 200]
+        self.assertEqual(self.flagged('self_zscore', [1] * len(usage), usage), [])
+
+    def test_house_is_compared_with_its_unit_type(self):
+        # Every house of the unit type uses about 10 units except one
+        meter_ids = list(range(12))
+        usage = [10, 11, 9, 10, 12, 10, 9, 11, 10, 10, 11, 200]
+        self.assertEqual(self.flagged('peer_zscore', meter_ids, usage), [11])
+        self.assertEqual(self.flagged('peer_zscore', meter_ids, usage, unit_codes=[0] * 11 + [1]), [])
+
+    def test_zero_streak_is_flagged_from_its_third_reading(self):
+        meter_ids = [1, 1, 1, 1, 1, 2, 2, 3, 3]
+        usage = [5, 0, 0, 0, 0, 4, 0, 0, 0]
+        # Meter 3's zeros do not continue the streak meter 2 ended with
+        self.assertEqual(self.flagged('zero_streak', meter_ids, usage), [3, 4])
+
+
+class DetectAnomaliesTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='reader')
+        house = House.objects.create(hse_number='A1', unit_type='2BR')
+        self.meter = Meter.objects.create(
+            meter_number='M-A1', house=house, installation_date=date(2024, 1, 1)
+        )
+
+    def add(self, value, reading_date):
+        reading = MeterReading(
+            meter=self.meter, current_reading=Decimal(value), reading_date=reading_date, read_by=self.user
+        )
+        reading.save()
+        return reading
+
+    def test_scan_only_flags_readings_after_the_watermark(self):
+        for month in range(1, 5):
+            last = self.add(10, date(2026, month, 1))  # Used 10 units, then nothing for three months
+
+        self.assertEqual(detect_anomalies(), 1)
+        self.assertEqual(list(Anomaly.objects.values_list('reading_id', 'kind')), [(last.pk, 'zero_streak')])
+        self.assertEqual(AnomalyScan.objects.get().last_reading_id, last.pk)
+
+        self.assertEqual(detect_anomalies(), 0)
+
+        newer = self.add(10, date(2026, 5, 1))
+        self.assertEqual(detect_anomalies(), 1)
+        self.assertEqual(Anomaly.objects.get(reading=newer).score, 4)
+        self.assertEqual(AnomalyScan.objects.first().last_reading_id, newer.pk)
+
+    def test_full_scan_does_not_duplicate_flags(self):
+        for month in range(1, 6):
+            self.add(10, date(2026, month, 1))
+        detect_anomalies()
+        detect_anomalies(full=True)
+
+        self.assertEqual(Anomaly.objects.count(), 2)
@@ -6,4 +6,8 @@ urlpatterns = [
     path('house/<int:house_pk>/meter/create/', views.MeterCreateView.as_view(), name='meter-create'),
     path('meter/<int:pk>/replace/', views.MeterReplaceView.as_view(), name='meter-replace'),
     path('meter/<int:meter_pk>/reading/', views.ReadingCreateView.as_view(), name='reading-create'),
+    path('meter/readings/import/', views.ReadingImportView.as_view(), name='reading-import'),
+    path('meter/readings/export/', views.ReadingExportView.as_view(), name='reading-export'),
+    path('meter/round/', views.ReadingRoundView.as_view(), name='reading-round'),
+    path('meter/readings/sync/', views.ReadingSyncView.as_view(), name='reading-sync'),
 ]
\ No newline at end of file
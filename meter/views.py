@@ -1,45 +1,85 @@
-from django.views.generic import ListView, CreateView, DetailView, UpdateView, DeleteView
+import hashlib
+import json
+import uuid
+from django.views.generic import ListView, CreateView, DetailView, UpdateView, DeleteView, View
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.shortcuts import get_object_or_404
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy
 from django.contrib import messages
-from django.utils import timezone
+from django.core.paginator import Paginator
+from django.db.models import Avg, Count, Sum
 from house.models import House
+from billing.engine import period_bounds
+from billing.tariffs import TariffNotFound, price
+from ems.exports import csv_response
+from ems.imports import UnreadableFile, open_upload
 from .models import Meter, MeterReading
 from django.utils.timezone import now
-from .forms import MeterForm, MeterReplacementForm, MeterReadingForm
+from django.http import HttpResponse, JsonResponse
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.cache import get_conditional_response
+from django.utils.decorators import method_decorator
+from django.utils.http import quote_etag
+from django.views.decorators.csrf import ensure_csrf_cookie
+from .forms import MeterForm, MeterReplacementForm, MeterReadingForm, ReadingImportForm
+from .exporters import READING_EXPORT_HEADER, reading_rows
+from .importers import ReadingImporter, detect_format, read_rows
+from .readings import record_reading
 
 class HouseMeterView(LoginRequiredMixin, DetailView):
     model = House
     template_name = 'meter/house_meter.html'
     context_object_name = 'house'
+    readings_per_page = 12
+    invoices_shown = 12
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         meter = self.object.meters.filter(is_current=True).first()
         context['meter'] = meter
+        context['invoices'] = self.object.invoices.select_related(
+            'period'
+        ).order_by('-period__start_date')[:self.invoices_shown]
         
         if not meter:
             return context
             
-        readings = meter.readings.all()
-        context['readings'] = readings
-        
-        if meter.readings.exists():
-            context['previous_reading'] = meter.readings.order_by('-reading_date', '-id').first().current_reading
-        else:
-            context['previous_reading'] = 0
+        context['previous_reading'] = meter.last_actual_value
+        # Resubmitting the same form returns the reading it already created
+        context['idempotency_key'] = uuid.uuid4().hex
+        if meter.last_reading_id is None:
             return context
-            
-        total_consumption = sum(reading.consumption for reading in readings)
-        total_bill = sum(reading.bill_amount for reading in readings)
-        highest_reading = max(readings, key=lambda x: x.consumption)
-        
+
+        summary = meter.readings.aggregate(
+            total_consumption=Sum('consumption'),
+            avg_consumption=Avg('consumption'),
+            readings_count=Count('id'),
+        )
+        # What the billing runs charged, tiered per period like the invoices
+        total_bill = self.object.invoices.aggregate(total=Sum('amount'))['total']
+
+        paginator = Paginator(meter.readings.select_related('read_by'), self.readings_per_page)
+        paginator.count = summary['readings_count']  # Already counted above
+        readings = paginator.get_page(self.request.GET.get('page'))
+        # A reading dated before any tariff is shown unpriced instead of failing the page
+        missing_tariffs = set()
+        for reading in readings:
+            try:
+                reading.amount = price(self.object.unit_type, reading.reading_date, reading.consumption)
+            except TariffNotFound as e:
+                reading.amount = None
+                missing_tariffs.add(str(e))
+        for error in sorted(missing_tariffs):
+            messages.warning(self.request, f'{error}, those readings are not priced')
+
         context.update({
-            'total_consumption': total_consumption,
+            'readings': readings,
+            'page_obj': readings,
+            'total_consumption': summary['total_consumption'],
             'total_bill': total_bill,
-            'highest_reading': highest_reading,
-            'avg_consumption': round(total_consumption / readings.count(), 2)
+            'highest_reading': meter.readings.order_by('-consumption', '-reading_date').first(),
+            'avg_consumption': round(summary['avg_consumption'], 2)
         })
         
         return context
@@ -110,11 +150,148 @@ class ReadingCreateView(LoginRequiredMixin, CreateView):
         kwargs['meter'] = get_object_or_404(Meter, pk=self.kwargs['meter_pk'])
         return kwargs
 
+    def get_idempotency_key(self):
+        return (
+            self.request.POST.get('idempotency_key')
+            or self.request.headers.get('Idempotency-Key')
+        )
+
+    def post(self, request, *args, **kwargs):
+        # A retried submission returns the reading it already created
+        idempotency_key = self.get_idempotency_key()
+        if idempotency_key:
+            self.object = MeterReading.objects.filter(
+                meter_id=self.kwargs['meter_pk'],
+                idempotency_key=idempotency_key
+            ).select_related('meter').first()
+            if self.object:
+                return redirect(self.get_success_url())
+        return super().post(request, *args, **kwargs)
+
     def form_valid(self, form):
-        form.instance.meter_id = self.kwargs['meter_pk']
-        form.instance.read_by = self.request.user
-        form.instance.reading_date = timezone.now().date()
-        return super().form_valid(form)
+        try:
+            self.object, created = record_reading(
+                self.kwargs['meter_pk'],
+                form.cleaned_data['current_reading'],
+                self.request.user,
+                idempotency_key=self.get_idempotency_key()
+            )
+        except ValidationError as e:
+            form.add_error('current_reading', e)
+            return self.form_invalid(form)
+        messages.success(self.request, 'Reading saved successfully')
+        return redirect(self.get_success_url())
+
+    def form_invalid(self, form):
+        # The form lives on the house meter page, so every error goes back as a message
+        for field, errors in form.errors.items():
+            prefix = '' if field in (NON_FIELD_ERRORS, 'current_reading') else f'{form[field].label}: '
+            for error in errors:
+                messages.error(self.request, prefix + error)
+        meter = get_object_or_404(Meter, pk=self.kwargs['meter_pk'])
+        return redirect('house-meter', pk=meter.house_id)
 
     def get_success_url(self):
-        return reverse_lazy('house-meter', kwargs={'pk': self.object.meter.house.pk})
\ No newline at end of file
+        return reverse_lazy('house-meter', kwargs={'pk': self.object.meter.house.pk})
+
+class ReadingImportView(LoginRequiredMixin, View):
+    """Bulk upload of meter readings as CSV or JSONL, answered with per-row errors"""
+
+    def post(self, request, *args, **kwargs):
+        form = ReadingImportForm(request.POST, request.FILES)
+        if not form.is_valid():
+            return JsonResponse({'errors': form.errors}, status=400)
+
+        upload = form.cleaned_data['file']
+        fmt = form.cleaned_data['format'] or detect_format(upload.name)
+        importer = ReadingImporter(request.user)
+        try:
+            importer.run(read_rows(open_upload(upload), fmt))
+        except UnreadableFile as e:
+            return JsonResponse({'errors': {'file': [str(e)]}}, status=400)
+
+        return JsonResponse({
+            'created': importer.created,
+            'duplicates': importer.duplicates,
+            'rejected': len(importer.errors),
+            'errors': importer.errors,
+        })
+
+
+class ReadingExportView(LoginRequiredMixin, View):
+    """Readings of a period (?period=YYYY-MM) streamed as CSV"""
+
+    def get(self, request, *args, **kwargs):
+        label = request.GET.get('period', '')
+        try:
+            start_date, end_date = period_bounds(label)
+        except ValidationError as e:
+            return JsonResponse({'errors': {'period': e.messages}}, status=400)
+
+        return csv_response(
+            f'readings-{start_date:%Y-%m}.csv', READING_EXPORT_HEADER, reading_rows(start_date, end_date)
+        )
+
+
+@method_decorator(ensure_csrf_cookie, name='dispatch')
+class ReadingRoundView(LoginRequiredMixin, View):
+    """Compact manifest of the current meters of a block for offline reading rounds
+
+    Houses are selected by house number prefix (?block=A). The manifest is
+    built from the denormalized last reading fields in one query and carries
+    an ETag so unchanged rounds are answered with 304 Not Modified.
+    """
+    fields = ['house_id', 'hse_number', 'meter_id', 'meter_number', 'last_reading', 'last_reading_date']
+
+    def get(self, request, *args, **kwargs):
+        block = request.GET.get('block', '').strip()
+        meters = Meter.objects.filter(
+            is_current=True,
+            house__hse_number__startswith=block
+        ).order_by('house__hse_number').values_list(
+            'house_id', 'house__hse_number', 'id', 'meter_number', 'last_actual_value', 'last_reading_date'
+        )
+        body = json.dumps({
+            'block': block,
+            'fields': self.fields,
+            'houses': list(meters),
+        }, cls=DjangoJSONEncoder, separators=(',', ':'))
+
+        etag = quote_etag(hashlib.md5(body.encode()).hexdigest())
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(body, content_type='application/json')
+        response['ETag'] = etag
+        return response
+
+
+class ReadingSyncView(LoginRequiredMixin, View):
+    """Batch upload of readings taken offline, answered with a result per item
+
+    The body is a JSON list of readings (or {"readings": [...]}) with
+    meter_number, current_reading and optional reading_date and
+    idempotency_key, so a sync that is retried after a dropped connection
+    does not record anything twice.
+    """
+
+    def post(self, request, *args, **kwargs):
+        try:
+            payload = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({'error': 'Invalid JSON'}, status=400)
+        items = payload.get('readings') if isinstance(payload, dict) else payload
+        if not isinstance(items, list):
+            return JsonResponse({'error': 'Expected a list of readings'}, status=400)
+
+        importer = ReadingImporter(request.user)
+        importer.run(
+            (index, item if isinstance(item, dict) else None)
+            for index, item in enumerate(items)
+        )
+
+        return JsonResponse({
+            'created': importer.created,
+            'duplicates': importer.duplicates,
+            'rejected': len(importer.errors),
+            'results': importer.results,
+        })
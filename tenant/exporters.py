@@ -0,0 +1,22 @@
+from django.db.models import FilteredRelation, Q
+
+from ems.exports import CHUNK_SIZE
+
+from .models import Tenant
+
+TENANT_FIELDS = [
+    'first_name', 'middle_name', 'last_name', 'email', 'phone_number',
+    'id_cardnumber', 'nationality', 'status', 'created_at',
+]
+TENANT_EXPORT_HEADER = TENANT_FIELDS + ['house', 'tenancy_start']
+
+
+def tenant_rows(chunk_size=CHUNK_SIZE):
+    """Every tenant with the house and start of their current tenancy, joined in one streamed query"""
+    return Tenant.objects.annotate(
+        current_tenancy=FilteredRelation('tenancy_set', condition=Q(tenancy_set__end_date__isnull=True)),
+    ).order_by('id').values_list(
+        *TENANT_FIELDS,
+        'current_tenancy__house__hse_number',
+        'current_tenancy__start_date',
+    ).iterator(chunk_size=chunk_size)
@@ -1,22 +1,19 @@
 from django import forms
 from .models import Tenant, Household, Tenancy
 from house.models import House
-from django.db import models 
+from django.db import transaction
+
+
+OCCUPIED = 'This house is already occupied.'
 
 
 class TenantForm(forms.ModelForm):
     house = forms.ModelChoiceField(
-        queryset=House.objects.filter(
-            # A house is available if it has no active tenancy
-            ~models.Exists(
-                Tenancy.objects.filter(
-                    house=models.OuterRef('pk'),
-                    end_date__isnull=True
-                )
-            )
-        ),
+        # A house is available if it has no current tenancy
+        queryset=House.objects.available(),
         required=False,
-        label='House (Optional)'
+        label='House (Optional)',
+        error_messages={'invalid_choice': OCCUPIED}
     )
 
     class Meta:
@@ -33,40 +30,25 @@ class TenantForm(forms.ModelForm):
             tenant.created_by = created_by
         
         if commit:
-            tenant.save()
-            
-            # If house is selected, create a tenancy
-            house = self.cleaned_data.get('house')
-            if house:
-                Tenancy.objects.create(
-                    tenant=tenant,
-                    house=house,
-                    created_by=created_by
-                )
-                # Update house status
-                house.status = 'occupied'
-                house.save()
+            # The tenant is only kept if the house can still be let to them
+            with transaction.atomic():
+                tenant.save()
+                
+                # If house is selected, create a tenancy
+                house = self.cleaned_data.get('house')
+                if house:
+                    Tenancy.objects.create(
+                        tenant=tenant,
+                        house=house,
+                        created_by=created_by
+                    )
+                    # Update house status; a full save would write back the
+                    # stale current_tenancy the tenancy has just replaced
+                    house.status = 'occupied'
+                    house.save(update_fields=['status'])
         
         return tenant
 
-    def clean(self):
-        cleaned_data = super().clean()
-        house = cleaned_data.get('house')
-        
-        if house:
-            # Check if house is already occupied
-            existing_tenancy = Tenancy.objects.filter(
-                house=house,
-                end_date__isnull=True
-            ).exists()
-            
-            if existing_tenancy:
-                raise forms.ValidationError({
-                    'house': 'This house is already occupied.'
-                })
-        
-        return cleaned_data
-
 class HouseholdForm(forms.ModelForm):
     class Meta:
         model = Household
@@ -88,28 +70,5 @@ class TenancyForm(forms.ModelForm):
         
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields['house'].queryset = House.objects.filter(
-            ~models.Exists(
-                Tenancy.objects.filter(
-                    house=models.OuterRef('pk'),
-                    end_date__isnull=True
-                )
-            )
-        )
-    
-    def clean(self):
-        cleaned_data = super().clean()
-        house = cleaned_data.get('house')
-        
-        if house:
-            existing_tenancy = Tenancy.objects.filter(
-                house=house,
-                end_date__isnull=True
-            ).exists()
-            
-            if existing_tenancy:
-                raise forms.ValidationError({
-                    'house': 'This house is already occupied.'
-                })
-        
-        return cleaned_data
\ No newline at end of file
+        self.fields['house'].queryset = House.objects.available()
+        self.fields['house'].error_messages['invalid_choice'] = OCCUPIED
\ No newline at end of file
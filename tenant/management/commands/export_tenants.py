@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ems.exports import CHUNK_SIZE, write_csv
+from tenant.exporters import TENANT_EXPORT_HEADER, tenant_rows
+
+
+class Command(BaseCommand):
+    help = 'Export all tenants with their current tenancy as CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file to write')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Rows fetched per database round trip')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], 'w', encoding='utf-8', newline='') as stream:
+                written = write_csv(stream, TENANT_EXPORT_HEADER, tenant_rows(options['chunk_size']))
+        except OSError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(f"Exported {written} tenants to {options['path']}."))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from house.models import House
+from tenant.models import Tenancy
+
+
+class Command(BaseCommand):
+    help = 'End the current tenancies of the given houses in one transaction'
+
+    def add_arguments(self, parser):
+        parser.add_argument('hse_numbers', nargs='+', metavar='hse_number', help='Houses whose tenants move out')
+
+    def handle(self, *args, **options):
+        numbers = set(options['hse_numbers'])
+        missing = numbers - set(House.objects.filter(hse_number__in=numbers).values_list('hse_number', flat=True))
+        if missing:
+            raise CommandError(f"Unknown houses: {', '.join(sorted(missing))}")
+
+        ended = Tenancy.objects.filter(house__hse_number__in=numbers).end_tenancies()
+        self.stdout.write(self.style.SUCCESS(
+            f'Ended {ended} tenancies, {len(numbers) - ended} of the houses had no current tenancy.'
+        ))
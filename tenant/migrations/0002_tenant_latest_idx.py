@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-18 02:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenant', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tenant',
+            index=models.Index(fields=['-created_at', '-id'], name='tenant_latest_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.16 on 2026-10-18 02:44
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def end_superseded_tenancies(apps, schema_editor):
+    # Houses let twice before the constraint existed keep their latest
+    # tenancy; earlier ones end when the next one started
+    Tenancy = apps.get_model('tenant', 'Tenancy')
+    open_tenancies = Tenancy.objects.filter(end_date__isnull=True)
+    duplicated = open_tenancies.values('house').annotate(count=Count('pk')).filter(count__gt=1).values('house')
+    superseded = []
+    previous = None
+    for tenancy in open_tenancies.filter(house__in=duplicated).order_by('house', 'start_date', 'pk'):
+        if previous is not None and previous.house_id == tenancy.house_id:
+            previous.end_date = tenancy.start_date
+            superseded.append(previous)
+        previous = tenancy
+    Tenancy.objects.bulk_update(superseded, ['end_date'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tenant', '0002_tenant_latest_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(end_superseded_tenancies, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='tenancy',
+            constraint=models.UniqueConstraint(condition=models.Q(('end_date__isnull', True)), fields=('house',), name='unique_current_tenancy_per_house'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 4.2.16 on 2026-10-18 02:48
+
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def trim_overlapping_tenancies(apps, schema_editor):
+    # Tenancies of a house recorded with overlapping dates end when the
+    # next one started, so every moment has at most one occupant
+    Tenancy = apps.get_model('tenant', 'Tenancy')
+    House = apps.get_model('house', 'House')
+    trimmed = []
+    previous = None
+    for tenancy in Tenancy.objects.order_by('house', 'start_date', 'pk').only('id', 'house_id', 'start_date', 'end_date'):
+        if (previous is not None and previous.house_id == tenancy.house_id
+                and (previous.end_date is None or previous.end_date > tenancy.start_date)):
+            previous.end_date = tenancy.start_date
+            trimmed.append(previous)
+        previous = tenancy
+    Tenancy.objects.bulk_update(trimmed, ['end_date'], batch_size=1000)
+    if trimmed:
+        House.objects.update(current_tenancy=Subquery(
+            Tenancy.objects.filter(house=OuterRef('pk'), end_date__isnull=True).order_by('pk').values('pk')[:1]
+        ))
+
+
+def create_occupancy_range(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'ALTER TABLE tenant_tenancy ADD COLUMN occupancy tstzrange'
+        " GENERATED ALWAYS AS (tstzrange(start_date, end_date, '[)')) STORED"
+    )
+    schema_editor.execute(
+        'ALTER TABLE tenant_tenancy ADD CONSTRAINT tenancy_no_overlap'
+        ' EXCLUDE USING gist (house_id WITH =, occupancy WITH &&)'
+    )
+
+
+def drop_occupancy_range(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('ALTER TABLE tenant_tenancy DROP CONSTRAINT IF EXISTS tenancy_no_overlap')
+    schema_editor.execute('ALTER TABLE tenant_tenancy DROP COLUMN IF EXISTS occupancy')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('house', '0014_house_current_tenancy'),
+        ('tenant', '0003_tenancy_unique_current_tenancy_per_house'),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.AddIndex(
+            model_name='tenancy',
+            index=models.Index(fields=['house', 'start_date'], name='tenancy_house_start_idx'),
+        ),
+        migrations.RunPython(trim_overlapping_tenancies, migrations.RunPython.noop),
+        migrations.RunPython(create_occupancy_range, drop_occupancy_range),
+    ]
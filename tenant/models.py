@@ -1,7 +1,8 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.utils import timezone
 from house.models import House
+from house.search import update_documents
 
 class Tenant(models.Model):
     STATUS_CHOICES = [
@@ -24,6 +25,11 @@ class Tenant(models.Model):
     )
     created_at = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='tenant_latest_idx'),
+        ]
+
     def __str__(self):
         return self.get_full_name()
 
@@ -41,6 +47,30 @@ class Tenant(models.Model):
         current_tenancy = self.get_current_tenancy()
         return current_tenancy.house if current_tenancy else None
 
+class TenancyQuerySet(models.QuerySet):
+    def end_tenancies(self, end_date=None):
+        """End the open tenancies in this queryset as one transaction.
+
+        Their active household members, tenants and houses are each updated
+        with a single UPDATE and the search documents of the houses are
+        rebuilt in bulk, so a batch of move-outs costs the same number of
+        statements whatever its size. Returns the number of tenancies ended.
+        """
+        end_date = end_date or timezone.now()
+        with transaction.atomic():
+            rows = list(self.filter(end_date__isnull=True).select_for_update().values_list('pk', 'house_id'))
+            if not rows:
+                return 0
+            tenancy_ids = [pk for pk, _ in rows]
+            house_ids = [house_id for _, house_id in rows]
+            Household.objects.filter(tenancy_id__in=tenancy_ids, enddate_at__isnull=True).update(enddate_at=end_date)
+            Tenant.objects.filter(tenancy_set__in=tenancy_ids).update(status='ended')
+            House.objects.filter(pk__in=house_ids).update(status='vacant', current_tenancy=None)
+            Tenancy.objects.filter(pk__in=tenancy_ids).update(end_date=end_date)
+            # update() skips the signals keeping the house search index in sync
+            update_documents(house_ids)
+        return len(rows)
+
 class Tenancy(models.Model):
     """Model to track tenant occupation of houses over time"""
     tenant = models.ForeignKey(
@@ -62,26 +92,44 @@ class Tenancy(models.Model):
     )
     created_at = models.DateTimeField(default=timezone.now)
 
+    objects = TenancyQuerySet.as_manager()
+
     class Meta:
         verbose_name_plural = "Tenancies"
+        constraints = [
+            # A house is let to one tenant at a time
+            models.UniqueConstraint(
+                fields=['house'],
+                condition=models.Q(end_date__isnull=True),
+                name='unique_current_tenancy_per_house'
+            ),
+        ]
+        indexes = [
+            # Occupancy lookups by house and date without the PostgreSQL range index
+            models.Index(fields=['house', 'start_date'], name='tenancy_house_start_idx'),
+        ]
         
     def __str__(self):
         return f"{self.tenant.get_full_name()} - {self.house}"
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.sync_house()
+
+    def sync_house(self):
+        """Point the house at this tenancy while it is open and off it once ended"""
+        stale = House.objects.filter(current_tenancy=self)
+        if self.end_date is None:
+            stale = stale.exclude(pk=self.house_id)
+        stale.update(current_tenancy=None)
+        if self.end_date is None:
+            House.objects.filter(pk=self.house_id).update(current_tenancy=self)
         
     def end_tenancy(self):
         """Properly end a tenancy with all related updates"""
-        self.end_date = timezone.now()
-        self.tenant.status = 'ended'
-        self.house.status = 'vacant'
-        
-        # End all related household memberships
-        for household in self.household_set.all():
-            household.enddate_at = timezone.now()
-            household.save()
-            
-        self.tenant.save()
-        self.house.save()
-        self.save()
+        Tenancy.objects.filter(pk=self.pk).end_tenancies()
+        self.refresh_from_db(fields=['end_date'])
 
 class Household(models.Model):    
     first_name = models.CharField(max_length=100)
@@ -0,0 +1,85 @@
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import datetime, time
+
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Tenancy
+
+
+def as_instant(when):
+    """Aware datetime of a date (start of the day) or datetime"""
+    if not isinstance(when, datetime):
+        when = datetime.combine(when, time.min)
+    if timezone.is_naive(when):
+        when = timezone.make_aware(when)
+    return when
+
+
+def _postgresql_batch(house_ids, instants):
+    # tenant_tenancy.occupancy is a generated tstzrange column covered by
+    # the GiST exclusion constraint, so each pair is one index probe
+    found = {}
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT q.position, t.id'
+            ' FROM unnest(%s::bigint[], %s::timestamptz[]) WITH ORDINALITY AS q(house_id, at, position)'
+            ' JOIN tenant_tenancy t ON t.house_id = q.house_id AND t.occupancy @> q.at',
+            [house_ids, instants]
+        )
+        for position, tenancy_id in cursor.fetchall():
+            found[position - 1] = tenancy_id
+    return [found.get(index) for index in range(len(house_ids))]
+
+
+def _sorted_interval_batch(house_ids, instants):
+    # Tenancies overlapping the requested span, sorted by start per house
+    # and searched with bisect; the latest tenancy started wins
+    starts = defaultdict(list)
+    intervals = defaultdict(list)
+    tenancies = Tenancy.objects.filter(
+        Q(end_date__isnull=True) | Q(end_date__gt=min(instants)),
+        house_id__in=set(house_ids),
+        start_date__lte=max(instants),
+    ).order_by('house_id', 'start_date', 'pk').values_list('house_id', 'start_date', 'end_date', 'pk')
+    for house_id, start_date, end_date, pk in tenancies:
+        starts[house_id].append(start_date)
+        intervals[house_id].append((end_date, pk))
+
+    resolved = []
+    for house_id, at in zip(house_ids, instants):
+        index = bisect_right(starts[house_id], at) - 1
+        tenancy_id = None
+        if index >= 0:
+            end_date, pk = intervals[house_id][index]
+            if end_date is None or at < end_date:
+                tenancy_id = pk
+        resolved.append(tenancy_id)
+    return resolved
+
+
+def tenancy_batch(pairs):
+    """Resolve an iterable of (house_id, date or datetime) to tenancy ids in one query.
+
+    Returns a list in the order of the pairs holding the id of the tenancy
+    occupying the house at that moment, or None when it was vacant.
+    Tenancies cover [start_date, end_date); a date is taken at the start of
+    the day, so a reading on a move-out day belongs to the outgoing tenant.
+    """
+    house_ids = []
+    instants = []
+    for house_id, when in pairs:
+        house_ids.append(house_id)
+        instants.append(as_instant(when))
+    if not house_ids:
+        return []
+    if connection.vendor == 'postgresql':
+        return _postgresql_batch(house_ids, instants)
+    return _sorted_interval_batch(house_ids, instants)
+
+
+def tenancy_at(house_id, when):
+    """Id of the tenancy occupying a house at a date or datetime, None if it was vacant"""
+    return tenancy_batch([(house_id, when)])[0]
@@ -1,3 +1,125 @@
+from datetime import date, datetime, timedelta
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, connection, transaction
 from django.test import TestCase
+from django.utils import timezone
+
+from house.models import House
+from .forms import TenantForm
+from .models import Household, Tenancy, Tenant
+from .occupancy import as_instant, tenancy_at, tenancy_batch
+
+
+class TenantFormTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='staff')
+        self.house = House.objects.create(hse_number='A1', unit_type='2BR')
+
+    def test_letting_a_house_points_it_at_the_new_tenancy(self):
+        form = TenantForm(data={
+            'first_name': 'Jane', 'last_name': 'Doe', 'email': 'jane@example.com',
+            'phone_number': '0700000000', 'id_cardnumber': 1, 'status': 'active',
+            'house': self.house.pk,
+        })
+        self.assertTrue(form.is_valid(), form.errors)
+        tenant = form.save(created_by=self.user)
+
+        self.house.refresh_from_db()
+        self.assertEqual(self.house.current_tenancy, tenant.tenancy_set.get())
+        self.assertEqual(self.house.status, 'occupied')
+        self.assertFalse(House.objects.available().filter(pk=self.house.pk).exists())
+
+
+class EndTenanciesTests(TestCase):
+    def setUp(self):
+        self.tenancies = []
+        for number in (1, 2):
+            house = House.objects.create(hse_number=f'A{number}', unit_type='2BR')
+            tenant = Tenant.objects.create(
+                first_name='Tenant', last_name=str(number), email=f'tenant{number}@example.com',
+                phone_number=f'07000000{number:02d}', id_cardnumber=number,
+            )
+            tenancy = Tenancy.objects.create(tenant=tenant, house=house, start_date=as_instant(date(2026, 1, 1)))
+            Household.objects.create(
+                first_name='Member', last_name=str(number), email=f'member{number}@example.com',
+                phone_number=f'07100000{number:02d}', id_cardnumber=100 + number, tenancy=tenancy,
+            )
+            self.tenancies.append(tenancy)
+
+    def test_only_the_targeted_tenancies_are_ended(self):
+        leaving, staying = self.tenancies
+        end_date = as_instant(date(2026, 3, 31))
+
+        self.assertEqual(Tenancy.objects.filter(pk=leaving.pk).end_tenancies(end_date), 1)
+        self.assertEqual(Tenancy.objects.filter(pk=leaving.pk).end_tenancies(), 0)
+
+        leaving.refresh_from_db()
+        self.assertEqual(leaving.end_date, end_date)
+        self.assertEqual(leaving.tenant.status, 'ended')
+        self.assertEqual(leaving.household_set.get().enddate_at, end_date)
+        self.assertIsNone(leaving.house.current_tenancy)
+        self.assertEqual(leaving.house.status, 'vacant')
+
+        staying.refresh_from_db()
+        self.assertIsNone(staying.end_date)
+        self.assertEqual(staying.tenant.status, 'active')
+        self.assertIsNone(staying.household_set.get().enddate_at)
+        self.assertEqual(staying.house.current_tenancy, staying)
+        self.assertEqual(
+            list(House.objects.available().values_list('hse_number', flat=True)), [leaving.house.hse_number]
+        )
+
+
+class OccupancyTests(TestCase):
+    def setUp(self):
+        self.house = House.objects.create(hse_number='A1', unit_type='2BR')
+        self.vacant_house = House.objects.create(hse_number='B1', unit_type='2BR')
+        # Moved out in the afternoon of 20 March, next tenant moved in on 25 March
+        self.first = self.let(1, as_instant(date(2026, 3, 10)), timezone.make_aware(datetime(2026, 3, 20, 14)))
+        self.second = self.let(2, as_instant(date(2026, 3, 25)))
+
+    def let(self, number, start_date, end_date=None):
+        tenant = Tenant.objects.create(
+            first_name='Tenant', last_name=str(number), email=f'tenant{number}@example.com',
+            phone_number=f'07000000{number:02d}', id_cardnumber=number,
+        )
+        return Tenancy.objects.create(tenant=tenant, house=self.house, start_date=start_date, end_date=end_date)
+
+    def test_move_in_instant_belongs_to_the_new_tenancy(self):
+        self.assertEqual(tenancy_at(self.house.pk, self.first.start_date), self.first.pk)
+        self.assertEqual(tenancy_at(self.house.pk, date(2026, 3, 10)), self.first.pk)
+        self.assertIsNone(tenancy_at(self.house.pk, self.first.start_date - timedelta(microseconds=1)))
+
+    def test_move_out_day_belongs_to_the_outgoing_tenancy(self):
+        self.assertEqual(tenancy_at(self.house.pk, date(2026, 3, 20)), self.first.pk)
+        self.assertEqual(tenancy_at(self.house.pk, self.first.end_date - timedelta(microseconds=1)), self.first.pk)
+        self.assertIsNone(tenancy_at(self.house.pk, self.first.end_date))
+
+    def test_gap_between_tenancies_is_vacant(self):
+        self.assertIsNone(tenancy_at(self.house.pk, date(2026, 3, 21)))
+        self.assertIsNone(tenancy_at(self.house.pk, date(2026, 3, 24)))
+
+    def test_open_tenancy_covers_every_later_date(self):
+        self.assertEqual(tenancy_at(self.house.pk, date(2026, 3, 25)), self.second.pk)
+        self.assertEqual(tenancy_at(self.house.pk, date(2030, 1, 1)), self.second.pk)
+
+    def test_batch_is_aligned_with_its_pairs(self):
+        pairs = [
+            (self.house.pk, date(2030, 1, 1)),
+            (self.vacant_house.pk, date(2026, 3, 15)),
+            (self.house.pk, date(2026, 3, 15)),
+            (self.house.pk, date(2026, 3, 22)),
+        ]
+        self.assertEqual(tenancy_batch(pairs), [self.second.pk, None, self.first.pk, None])
+        self.assertEqual(tenancy_batch([]), [])
+
+    def test_second_open_tenancy_of_a_house_is_rejected(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self.let(3, as_instant(date(2026, 4, 1)))
 
-# Create your tests here.
+    @skipUnless(connection.vendor == 'postgresql', 'The overlap exclusion constraint needs PostgreSQL')
+    def test_overlapping_tenancies_are_rejected(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self.let(3, as_instant(date(2026, 3, 15)), as_instant(date(2026, 3, 18)))
@@ -4,6 +4,8 @@ from . import views
 urlpatterns = [
     # Tenant URLs
     path('tenant/', views.TenantListView.as_view(), name='tenant-list'),
+    path('tenant/export/', views.TenantExportView.as_view(), name='tenant-export'),
+    path('tenant/move-out/', views.TenancyMoveOutView.as_view(), name='tenancy-move-out'),
     path('tenant/add/', views.TenantCreateView.as_view(), name='tenant-create'),
     path('tenant/<int:pk>/', views.TenantDetailView.as_view(), name='tenant-detail'),
     path('tenant/<int:pk>/update/', views.TenantUpdateView.as_view(), name='tenant-update'),
@@ -1,19 +1,25 @@
-from django.views.generic import ListView, CreateView, UpdateView, DetailView
+from django.views.generic import ListView, CreateView, UpdateView, DetailView, View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import redirect, get_object_or_404
 from django.contrib import messages
 from django.urls import reverse_lazy
 from django.utils import timezone
-from django.db.models import Q, Exists, OuterRef
+from django.db import IntegrityError
+from django.db.models import Count, Q, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from .models import Tenant, Household, Tenancy
-from house.models import House
-from .forms import TenantForm, HouseholdForm, TenancyForm
+from .exporters import TENANT_EXPORT_HEADER, tenant_rows
+from .forms import OCCUPIED, TenantForm, HouseholdForm, TenancyForm
 from django.http import JsonResponse
+from ems.exports import csv_response
+from ems.pagination import KeysetPaginationMixin
 
-class TenantListView(LoginRequiredMixin, ListView):
+class TenantListView(LoginRequiredMixin, KeysetPaginationMixin, ListView):
     model = Tenant
     template_name = 'tenant/tenant_list.html'
     context_object_name = 'tenants'
+    keyset = ('-created_at', '-id')
+    estimate_count = True
     paginate_by = 100
     
     def get_queryset(self):
@@ -35,25 +41,29 @@ class TenantListView(LoginRequiredMixin, ListView):
         status_filter = self.request.GET.get('status', '')
         if status_filter:
             queryset = queryset.filter(status=status_filter)
-            
-        return queryset.order_by('-created_at')
+
+        # House of the current tenancy and its active household members,
+        # evaluated only for the rows on the page
+        current_tenancies = Tenancy.objects.filter(tenant=OuterRef('pk'), end_date__isnull=True)
+        members = Household.objects.filter(
+            tenancy__tenant=OuterRef('pk'),
+            tenancy__end_date__isnull=True,
+            enddate_at__isnull=True,
+        ).order_by().values('tenancy__tenant').annotate(count=Count('pk')).values('count')
+        return queryset.annotate(
+            current_house_number=Subquery(current_tenancies.order_by('pk').values('house__hse_number')[:1]),
+            household_members=Coalesce(Subquery(members), 0),
+        )
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        # Get available houses (those without active tenancies)
-        context['available_houses'] = House.objects.filter(
-            ~Exists(
-                Tenancy.objects.filter(
-                    house=OuterRef('pk'),
-                    end_date__isnull=True
-                )
-            ),
-        ).order_by('hse_number')
         
-        # Count statistics
-        context['active_count'] = Tenant.objects.filter(status='active').count()
-        context['notice_count'] = Tenant.objects.filter(status='notice').count()
-        context['ended_count'] = Tenant.objects.filter(status='ended').count()
+        # Status counters in a single query
+        context.update(Tenant.objects.aggregate(
+            active_count=Count('pk', filter=Q(status='active')),
+            notice_count=Count('pk', filter=Q(status='notice')),
+            ended_count=Count('pk', filter=Q(status='ended')),
+        ))
         context['household_count'] = Household.objects.filter(
             tenancy__end_date__isnull=True
         ).count()
@@ -63,17 +73,30 @@ class TenantListView(LoginRequiredMixin, ListView):
         context['status_filter'] = self.request.GET.get('status', '')
         context['search_query'] = self.request.GET.get('search', '')
         
-        
-        # Handle pagination parameters
-        params = []
-        if self.request.GET.get('search'):
-            params.append(f'search={self.request.GET.get("search")}')
-        if self.request.GET.get('status'):
-            params.append(f'status={self.request.GET.get("status")}')
-        context['extra_url_params'] = f'&{"&".join(params)}' if params else ''
-        
         return context
 
+class TenantExportView(LoginRequiredMixin, View):
+    """All tenants with their current tenancy streamed as CSV"""
+
+    def get(self, request, *args, **kwargs):
+        return csv_response(f'tenants-{timezone.localdate():%Y-%m-%d}.csv', TENANT_EXPORT_HEADER, tenant_rows())
+
+class TenancyMoveOutView(LoginRequiredMixin, View):
+    """End many tenancies at once, e.g. every lease expiring this month
+
+    POST tenancy=<id> and/or house=<id> (repeated). Answers with the number
+    of tenancies ended; already ended ones are skipped.
+    """
+
+    def post(self, request, *args, **kwargs):
+        tenancy_ids = [pk for pk in request.POST.getlist('tenancy') if pk.isdigit()]
+        house_ids = [pk for pk in request.POST.getlist('house') if pk.isdigit()]
+        if not tenancy_ids and not house_ids:
+            return JsonResponse({'error': 'Give at least one tenancy or house'}, status=400)
+
+        tenancies = Tenancy.objects.filter(Q(pk__in=tenancy_ids) | Q(house_id__in=house_ids))
+        return JsonResponse({'ended': tenancies.end_tenancies()})
+
 class TenantCreateView(LoginRequiredMixin, CreateView):
     model = Tenant
     form_class = TenantForm
@@ -82,7 +105,12 @@ class TenantCreateView(LoginRequiredMixin, CreateView):
     def form_valid(self, form):
         form.instance.created_by = self.request.user
         form.instance.status = 'active'
-        response = super().form_valid(form)
+        try:
+            response = super().form_valid(form)
+        except IntegrityError:
+            # The house was let to someone else after the form was validated
+            form.add_error('house', OCCUPIED)
+            return self.form_invalid(form)
         messages.success(self.request, 'Tenant added successfully.')
         return response
 
@@ -141,8 +169,12 @@ class TenantDetailView(LoginRequiredMixin, DetailView):
                 tenancy = tenancy_form.save(commit=False)
                 tenancy.tenant = self.object
                 tenancy.created_by = request.user
-                tenancy.save()
-                messages.success(request, 'New tenancy created successfully.')
+                try:
+                    tenancy.save()
+                except IntegrityError:
+                    messages.error(request, OCCUPIED)
+                else:
+                    messages.success(request, 'New tenancy created successfully.')
             else:
                 messages.error(request, 'Failed to create tenancy. Please check the form.')
         
@@ -163,7 +195,11 @@ class TenantUpdateView(LoginRequiredMixin, UpdateView):
         return context
     
     def form_valid(self, form):
-        response = super().form_valid(form)
+        try:
+            response = super().form_valid(form)
+        except IntegrityError:
+            form.add_error('house', OCCUPIED)
+            return self.form_invalid(form)
         messages.success(self.request, 'Tenant updated successfully.')
         return response
 